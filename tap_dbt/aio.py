@@ -0,0 +1,180 @@
+"""Optional asyncio HTTP engine for dbt Cloud API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+if TYPE_CHECKING:
+    import concurrent.futures
+    from collections.abc import Mapping
+
+    import aiohttp
+
+DEFAULT_TIMEOUT = 300
+
+
+class AsyncHTTPEngine:
+    """Issue HTTP requests from a background event loop.
+
+    Requests are sent by a single ``aiohttp`` session with a pooled connector, under a
+    global concurrency limit shared by every stream of the tap. Streams keep consuming
+    responses one at a time in the main thread, so Singer messages are still written in
+    order, while pages, partitions and child contexts that will be needed next are
+    requested ahead of time with :meth:`prefetch`.
+    """
+
+    def __init__(self, max_concurrency: int, timeout: float) -> None:
+        """Initialize the engine and start its event loop thread.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at any time.
+            timeout: Total timeout of a single request, in seconds.
+
+        Raises:
+            RuntimeError: If the ``async`` extra is not installed.
+        """
+        try:
+            import aiohttp  # noqa: PLC0415
+        except ImportError as exc:  # pragma: no cover
+            errmsg = (
+                "The async HTTP engine requires aiohttp. "
+                "Install it with `pip install tap-dbt[async]`."
+            )
+            raise RuntimeError(errmsg) from exc
+
+        self._aiohttp = aiohttp
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="tap-dbt-http",
+            daemon=True,
+        )
+        self._thread.start()
+
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+        self._prefetched: dict[
+            tuple[str, str], concurrent.futures.Future[requests.Response]
+        ] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = self._aiohttp.ClientSession(
+                connector=self._aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=self._aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def _send(self, request: requests.PreparedRequest) -> requests.Response:
+        session = await self._get_session()
+        assert self._semaphore is not None  # noqa: S101
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                async with session.request(
+                    request.method or "GET",
+                    request.url or "",
+                    headers=dict(request.headers),
+                    data=request.body,
+                    allow_redirects=False,
+                ) as resp:
+                    content = await resp.read()
+            except asyncio.TimeoutError as exc:
+                raise requests.exceptions.Timeout(str(exc), request=request) from exc
+            except self._aiohttp.ClientError as exc:
+                raise requests.exceptions.ConnectionError(
+                    str(exc),
+                    request=request,
+                ) from exc
+            elapsed = time.perf_counter() - start
+
+        response = requests.Response()
+        response.status_code = resp.status
+        response.reason = resp.reason or ""
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.url = str(resp.url)
+        response.encoding = resp.charset
+        response.elapsed = datetime.timedelta(seconds=elapsed)
+        response.request = request
+        response._content = content  # noqa: SLF001
+        return response
+
+    @staticmethod
+    def _key(request: requests.PreparedRequest) -> tuple[str, str]:
+        return (request.method or "GET", request.url or "")
+
+    def _submit(
+        self,
+        request: requests.PreparedRequest,
+    ) -> concurrent.futures.Future[requests.Response]:
+        return asyncio.run_coroutine_threadsafe(self._send(request), self._loop)
+
+    def prefetch(self, request: requests.PreparedRequest) -> None:
+        """Start a request whose response is expected to be needed soon.
+
+        Args:
+            request: An authenticated prepared request.
+        """
+        key = self._key(request)
+        with self._lock:
+            if key not in self._prefetched:
+                self._prefetched[key] = self._submit(request)
+
+    def send(self, request: requests.PreparedRequest) -> requests.Response:
+        """Send a request, reusing a matching prefetched response if there is one.
+
+        Args:
+            request: An authenticated prepared request.
+
+        Returns:
+            The response.
+        """
+        with self._lock:
+            future = self._prefetched.pop(self._key(request), None)
+        if future is None:
+            future = self._submit(request)
+        return future.result()
+
+    def close(self) -> None:
+        """Cancel pending prefetches, close the session and stop the event loop."""
+        with self._lock:
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched.clear()
+
+        async def _close() -> None:
+            if self._session is not None:
+                await self._session.close()
+
+        if self._thread.is_alive():
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.close()
+
+
+def create_engine(config: Mapping[str, Any]) -> AsyncHTTPEngine | None:
+    """Return an async HTTP engine if it is enabled in the tap configuration.
+
+    Args:
+        config: The tap configuration.
+
+    Returns:
+        A new engine, or None to send requests synchronously.
+    """
+    if not config.get("async_http"):
+        return None
+    return AsyncHTTPEngine(config.get("max_concurrent_requests", 8), DEFAULT_TIMEOUT)
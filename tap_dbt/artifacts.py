@@ -0,0 +1,233 @@
+"""Streaming parsers for dbt run artifacts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import IO, TYPE_CHECKING, Any, TypeAlias
+
+import ijson
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+
+    from singer_sdk.helpers.types import Record
+
+_Events: TypeAlias = "Iterator[tuple[str, str, Any]]"
+
+MANIFEST_SECTIONS = ("nodes", "sources", "exposures")
+RESULT_FIELDS = frozenset(
+    {"unique_id", "status", "execution_time", "thread_id", "timing", "failures"},
+)
+NODE_FIELDS = frozenset(
+    {
+        "unique_id",
+        "resource_type",
+        "package_name",
+        "name",
+        "original_file_path",
+        "checksum",
+        "depends_on",
+        "config",
+    },
+)
+CONFIG_FIELDS = frozenset(
+    {
+        "enabled",
+        "materialized",
+        "database",
+        "schema",
+        "alias",
+        "tags",
+        "unique_key",
+        "incremental_strategy",
+        "severity",
+    },
+)
+
+
+def _skip_value(events: _Events, depth: int = 0) -> None:
+    for _, event, _ in events:
+        if event in {"start_map", "start_array"}:
+            depth += 1
+        elif event in {"end_map", "end_array"}:
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _read_value(events: _Events) -> Any:  # noqa: ANN401
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in {"start_map", "start_array"}:
+            depth += 1
+        elif event in {"end_map", "end_array"}:
+            depth -= 1
+        if depth == 0:
+            return builder.value
+    return None
+
+
+def _read_fields(events: _Events, fields: Collection[str]) -> dict[str, Any]:
+    """Read the rest of an object, keeping only some of its fields.
+
+    Fields that are not kept are skipped without being built, so large values like
+    compiled SQL never take up memory.
+    """
+    obj: dict[str, Any] = {}
+    for _, event, value in events:
+        if event == "end_map":
+            break
+        if value in fields:
+            obj[value] = _read_value(events)
+        else:
+            _skip_value(events)
+    return obj
+
+
+def _read_object(events: _Events, fields: Collection[str]) -> dict[str, Any] | None:
+    """Read the next value if it is an object, keeping only some of its fields."""
+    _, event, _ = next(events)
+    if event == "start_map":
+        return _read_fields(events, fields)
+    if event == "start_array":
+        _skip_value(events, depth=1)
+    return None
+
+
+def iter_map_values(
+    fileobj: IO[bytes],
+    sections: Collection[str],
+    fields: Collection[str],
+) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Yield the objects of top-level maps of a JSON document as it is read.
+
+    Args:
+        fileobj: The JSON document.
+        sections: Keys of the top-level maps to read.
+        fields: Fields of each object to keep.
+
+    Yields:
+        The section, key and object of each entry of the maps.
+    """
+    events = iter(ijson.parse(fileobj))
+    for prefix, event, value in events:
+        if event == "map_key" and prefix in sections:
+            obj = _read_object(events, fields)
+            if obj is not None:
+                yield prefix, value, obj
+
+
+def iter_array_objects(
+    fileobj: IO[bytes],
+    array: str,
+    fields: Collection[str],
+) -> Iterator[dict[str, Any]]:
+    """Yield the objects of a top-level array of a JSON document as it is read.
+
+    Args:
+        fileobj: The JSON document.
+        array: Key of the top-level array to read.
+        fields: Fields of each object to keep.
+
+    Yields:
+        Each object of the array.
+    """
+    events = iter(ijson.parse(fileobj))
+    for prefix, event, _ in events:
+        if prefix == array and event == "start_array":
+            break
+    else:
+        return
+
+    for _, event, _ in events:
+        if event == "end_array":
+            return
+        if event == "start_map":
+            yield _read_fields(events, fields)
+        elif event == "start_array":
+            _skip_value(events, depth=1)
+
+
+def iter_manifest_nodes(fileobj: IO[bytes]) -> Iterator[Record]:
+    """Yield a compact record for each node, source and exposure of a manifest.
+
+    Memory use is bounded by the size of a single node, however large the manifest.
+
+    Args:
+        fileobj: The ``manifest.json`` document.
+
+    Yields:
+        One record per node.
+    """
+    for _, unique_id, node in iter_map_values(fileobj, MANIFEST_SECTIONS, NODE_FIELDS):
+        checksum = node.get("checksum")
+        depends_on = node.get("depends_on")
+        config = node.get("config")
+        yield {
+            "unique_id": node.get("unique_id", unique_id),
+            "resource_type": node.get("resource_type"),
+            "package_name": node.get("package_name"),
+            "name": node.get("name"),
+            "original_file_path": node.get("original_file_path"),
+            "checksum": (
+                checksum.get("checksum") if isinstance(checksum, dict) else checksum
+            ),
+            "depends_on": (
+                depends_on.get("nodes") if isinstance(depends_on, dict) else None
+            ),
+            "config": (
+                {key: value for key, value in config.items() if key in CONFIG_FIELDS}
+                if isinstance(config, dict)
+                else None
+            ),
+        }
+
+
+def manifest_checksum(fileobj: IO[bytes]) -> str:
+    """Return a content hash of the nodes of a manifest.
+
+    Only the fields kept by :func:`iter_manifest_nodes` are hashed, so manifests
+    which only differ by their invocation metadata have the same checksum.
+
+    Args:
+        fileobj: The ``manifest.json`` document.
+
+    Returns:
+        A 32 character hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for node in iter_manifest_nodes(fileobj):
+        payload = json.dumps(node, sort_keys=True, separators=(",", ":"), default=str)
+        digest.update(payload.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def iter_run_results(fileobj: IO[bytes]) -> Iterator[Record]:
+    """Yield the status and timing of each node of a ``run_results.json`` document.
+
+    Args:
+        fileobj: The ``run_results.json`` document.
+
+    Yields:
+        One record per node result.
+    """
+    for result in iter_array_objects(fileobj, "results", RESULT_FIELDS):
+        yield {
+            "unique_id": result.get("unique_id"),
+            "status": result.get("status"),
+            "execution_time": result.get("execution_time"),
+            "thread_id": result.get("thread_id"),
+            "failures": result.get("failures"),
+            "timing": [
+                {
+                    "name": phase.get("name"),
+                    "started_at": phase.get("started_at"),
+                    "completed_at": phase.get("completed_at"),
+                }
+                for phase in result.get("timing") or []
+            ],
+        }
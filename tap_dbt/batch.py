@@ -0,0 +1,152 @@
+"""Batch files written for Singer BATCH messages."""
+
+from __future__ import annotations
+
+import gzip
+import shutil
+import tempfile
+from typing import IO, TYPE_CHECKING, Any
+from uuid import uuid4
+
+from singer_sdk.singerlib.json import serialize_json
+
+if TYPE_CHECKING:
+    from singer_sdk.helpers._batch import BatchConfig
+    from singer_sdk.helpers.types import Record
+
+
+class RotatingBatchWriter:
+    """Write records to batch files, starting a new file once the current one is full.
+
+    A file is full once it holds ``batch_config.batch_size`` records or, if
+    ``max_bytes`` is set, once the serialized records it holds reach that many bytes
+    (before compression). JSONL files are gzip-compressed into a local temporary file
+    as records arrive, and copied to the batch storage when they are closed. Parquet
+    files are buffered in memory and written when they are closed.
+
+    The writer stays open between calls, so the records of a child stream that is
+    synced once per parent record end up in a few large files instead of one small
+    file per parent record.
+    """
+
+    def __init__(
+        self,
+        tap_name: str,
+        stream_name: str,
+        batch_config: BatchConfig,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            tap_name: The name of the tap.
+            stream_name: The name of the stream.
+            batch_config: The batch configuration.
+            max_bytes: Maximum uncompressed size of a file, in bytes.
+        """
+        self.batch_config = batch_config
+        self.max_bytes = max_bytes
+
+        self._sync_id = f"{tap_name}--{stream_name}-{uuid4()}"
+        self._file_index = 0
+        self._filename: str | None = None
+        self._tmp: IO[bytes] | None = None
+        self._gzip: gzip.GzipFile | None = None
+        self._buffer: list[Record] = []
+        self._records = 0
+        self._bytes = 0
+
+    @property
+    def is_parquet(self) -> bool:
+        """Whether batch files are written as Parquet."""
+        return self.batch_config.encoding.format == "parquet"
+
+    def _open(self) -> None:
+        self._file_index += 1
+        prefix = self.batch_config.storage.prefix or ""
+
+        if self.is_parquet:
+            self._filename = f"{prefix}{self._sync_id}-{self._file_index}.parquet"
+            if self.batch_config.encoding.compression == "gzip":
+                self._filename = f"{self._filename}.gz"
+            return
+
+        # Batch files are only opened in the storage once they are complete, since
+        # storage filesystems commit open files in a single shared transaction
+        self._filename = f"{prefix}{self._sync_id}-{self._file_index}.json.gz"
+        self._tmp = tempfile.TemporaryFile()  # noqa: SIM115
+        self._gzip = gzip.GzipFile(fileobj=self._tmp, mode="wb")
+
+    def _write_jsonl(self, filename: str) -> None:
+        assert self._gzip is not None  # noqa: S101
+        assert self._tmp is not None  # noqa: S101
+
+        self._gzip.close()
+        self._tmp.seek(0)
+        with self.batch_config.storage.open(filename, "wb") as f:
+            shutil.copyfileobj(self._tmp, f)
+        self._tmp.close()
+        self._gzip = None
+        self._tmp = None
+
+    def _write_parquet(self, filename: str) -> None:
+        import pyarrow as pa  # noqa: PLC0415
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        options: dict[str, Any] = {}
+        if self.batch_config.encoding.compression == "gzip":
+            options["compression"] = "gzip"
+
+        table = pa.Table.from_pylist(self._buffer)
+        with self.batch_config.storage.open(filename, "wb") as f:
+            pq.write_table(table, f, **options)
+        self._buffer = []
+
+    def write(self, record: Record) -> list[str] | None:
+        """Write a record to the current file.
+
+        Args:
+            record: The record.
+
+        Returns:
+            The manifest of the file if the record filled it up, otherwise None.
+        """
+        if self._filename is None:
+            self._open()
+
+        if self.is_parquet:
+            self._buffer.append(record)
+            if self.max_bytes:
+                self._bytes += len(serialize_json(record)) + 1
+        else:
+            line = (serialize_json(record) + "\n").encode()
+            assert self._gzip is not None  # noqa: S101
+            self._gzip.write(line)
+            self._bytes += len(line)
+
+        self._records += 1
+        if self._records >= self.batch_config.batch_size or (
+            self.max_bytes and self._bytes >= self.max_bytes
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> list[str] | None:
+        """Close the current file.
+
+        Returns:
+            The manifest of the closed file, or None if no file was open.
+        """
+        filename = self._filename
+        if filename is None:
+            return None
+
+        if self.is_parquet:
+            self._write_parquet(filename)
+        else:
+            self._write_jsonl(filename)
+
+        self._filename = None
+        self._records = 0
+        self._bytes = 0
+        return [self.batch_config.storage.get_url(filename)]
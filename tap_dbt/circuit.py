@@ -0,0 +1,129 @@
+"""Per-account circuit breaker for failing dbt Cloud accounts."""
+
+from __future__ import annotations
+
+import threading
+from http import HTTPStatus
+
+import requests
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+
+API_ERRORS = (
+    FatalAPIError,
+    RetriableAPIError,
+    requests.exceptions.RequestException,
+)
+"""Request errors counted as failures of an account."""
+
+
+class AccountCircuitOpenError(Exception):
+    """Raised instead of sending a request for an account whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive request failures of each account, for the duration of a sync.
+
+    The circuit of an account opens after ``threshold`` consecutive failed request
+    attempts, retries included. Requests for the account then fail right away with
+    :class:`AccountCircuitOpenError`. Any successful request closes the count again.
+    Nothing is persisted, so every sync starts with all circuits closed.
+    """
+
+    def __init__(self, threshold: int) -> None:
+        """Initialize the breaker.
+
+        Args:
+            threshold: Consecutive failures after which a circuit opens, or 0 to
+                never open circuits.
+        """
+        self.threshold = threshold
+        self._failures: dict[str, int] = {}
+        self._errors: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def is_open(self, account_id: str) -> bool:
+        """Whether requests for an account are skipped.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+
+        Returns:
+            True if the circuit of the account is open.
+        """
+        with self._lock:
+            return 0 < self.threshold <= self._failures.get(account_id, 0)
+
+    def check(self, account_id: str) -> None:
+        """Raise if requests for an account are skipped.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+
+        Raises:
+            AccountCircuitOpenError: If the circuit of the account is open.
+        """
+        if self.is_open(account_id):
+            errmsg = (
+                f"Circuit of account {account_id} is open: {self.describe(account_id)}"
+            )
+            raise AccountCircuitOpenError(errmsg)
+
+    def record_success(self, account_id: str) -> None:
+        """Reset the consecutive failures of an account.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+        """
+        with self._lock:
+            self._failures.pop(account_id, None)
+
+    def reset(self, account_id: str) -> None:
+        """Close the circuit of an account, so its next request is sent again.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+        """
+        with self._lock:
+            self._failures.pop(account_id, None)
+            self._errors.pop(account_id, None)
+
+    def record_failure(self, account_id: str, error: BaseException) -> bool:
+        """Count a failed request attempt of an account.
+
+        Rate-limited requests are not counted, they are retried with backoff.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+            error: The request error.
+
+        Returns:
+            True if this failure opened the circuit of the account.
+        """
+        if not isinstance(error, API_ERRORS) or self.threshold <= 0:
+            return False
+        response = getattr(error, "response", None)
+        if response is not None and (
+            response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        ):
+            return False
+
+        with self._lock:
+            failures = self._failures.get(account_id, 0) + 1
+            self._failures[account_id] = failures
+            self._errors[account_id] = str(error)
+        return failures == self.threshold
+
+    def describe(self, account_id: str) -> str:
+        """Describe why the circuit of an account is open.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+
+        Returns:
+            The number of consecutive failures and the last error.
+        """
+        with self._lock:
+            return (
+                f"{self._failures.get(account_id, 0)} consecutive failures, "
+                f"last error: {self._errors.get(account_id)}"
+            )
@@ -2,25 +2,54 @@
 
 from __future__ import annotations
 
+import contextlib
+import decimal
+import functools
 import importlib.resources
 import sys
+import urllib.parse
 from abc import abstractmethod
 from functools import cache, cached_property
-from typing import Any
+from typing import TYPE_CHECKING, Any, cast
 
+import requests
 import yaml
 from singer_sdk import RESTStream
 from singer_sdk.authenticators import APIAuthenticatorBase, SimpleAuthenticator
 from singer_sdk.helpers._typing import append_type
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk.pagination import OffsetPaginator, SinglePagePaginator
 from singer_sdk.singerlib import resolve_schema_references
 
 from tap_dbt import schemas
+from tap_dbt.batch import RotatingBatchWriter
+from tap_dbt.concurrency import blocking, ordered_chain, resumed
+from tap_dbt.replay import RecordingAdapter, ReplayAdapter
+from tap_dbt.schema_cache import get_schema_cache
 
 if sys.version_info >= (3, 12):
     from typing import override
 else:
     from typing_extensions import override
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
+    from singer_sdk.helpers.types import Context, Record, RequestFunc
+
+    from tap_dbt.aio import AsyncHTTPEngine
+    from tap_dbt.circuit import CircuitBreaker
+    from tap_dbt.concurrency import StreamScheduler
+    from tap_dbt.index import AccountIndex
+    from tap_dbt.progress import ProgressReporter
+    from tap_dbt.replay import HTTPArchive
+    from tap_dbt.response_cache import ResponseCache
+    from tap_dbt.tap import TapDBT
+
+
+_RESPONSE_JSON = "_tap_dbt_json"
+
 
 @cache
 def load_openapi(api_version: str) -> dict[str, Any]:
@@ -35,6 +64,46 @@ def load_openapi(api_version: str) -> dict[str, Any]:
         return yaml.safe_load(schema)  # type: ignore[no-any-return]
 
 
+def response_json(response: requests.Response) -> Any:  # noqa: ANN401
+    """Return the decoded JSON body of a response, decoding it only once.
+
+    Args:
+        response: The response.
+
+    Returns:
+        The response body, with floats decoded as decimals like the SDK does.
+    """
+    if _RESPONSE_JSON not in response.__dict__:
+        response.__dict__[_RESPONSE_JSON] = response.json(parse_float=decimal.Decimal)
+    return response.__dict__[_RESPONSE_JSON]
+
+
+def page_position(response: requests.Response) -> tuple[int, int, int | None]:
+    """Return where a page of an offset-paginated response is in its request.
+
+    Args:
+        response: The response.
+
+    Returns:
+        The offset of the page, its number of records and the total number of
+        records of the request, if the response has one.
+    """
+    query = urllib.parse.urlsplit(str(response.request.url)).query
+    offset = int(urllib.parse.parse_qs(query).get("offset", ["0"])[0])
+    try:
+        body = response_json(response)
+    except ValueError:
+        return offset, 0, None
+
+    data = body.get("data") if isinstance(body, dict) else None
+    count = len(data) if isinstance(data, list) else 0
+    try:
+        total_count = body["extra"]["pagination"]["total_count"]
+    except (KeyError, TypeError):
+        total_count = None
+    return offset, count, total_count
+
+
 class DBTStream(RESTStream):
     """dbt stream class."""
 
@@ -42,6 +111,14 @@ class DBTStream(RESTStream):
     records_jsonpath = "$.data[*]"
     api_version = "v2"
 
+    required_properties: tuple[str, ...] = ()
+    """Properties the stream needs internally, kept even if they are not selected."""
+
+    response_cache_ttl: int | None = None
+    """Seconds responses are cached for with ``response_cache``, None to never cache."""
+
+    _batch_writer: RotatingBatchWriter | None = None
+
     @override
     @property
     def url_base(self) -> str:
@@ -67,6 +144,407 @@ class DBTStream(RESTStream):
             },
         )
 
+    @property
+    @override
+    def requests_session(self) -> requests.Session:
+        """Return the requests session, recording or replaying an HTTP archive."""
+        session = super().requests_session
+        archive = self.http_archive
+        if archive is not None and not isinstance(
+            session.get_adapter("https://"),
+            RecordingAdapter | ReplayAdapter,
+        ):
+            adapter = (
+                RecordingAdapter(archive)
+                if archive.recording
+                else ReplayAdapter(
+                    archive,
+                    latency=self.config.get("http_archive_latency", False),
+                )
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        return session
+
+    @property
+    def http_archive(self) -> HTTPArchive | None:
+        """Return the HTTP archive shared by all streams, if one is configured."""
+        return cast("TapDBT", self._tap).http_archive
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the response cache shared by all streams, if it is enabled."""
+        return cast("TapDBT", self._tap).response_cache
+
+    @cached_property
+    def cache_ttl(self) -> int:
+        """Return the seconds responses of this stream are cached for, or 0."""
+        if self.response_cache is None or self.response_cache_ttl is None:
+            return 0
+        ttls: dict[str, int] = self.config.get("response_cache_ttls") or {}
+        return ttls.get(self.name, self.response_cache_ttl)
+
+    @property
+    def http_engine(self) -> AsyncHTTPEngine | None:
+        """Return the async HTTP engine shared by all streams, if it is enabled."""
+        return cast("TapDBT", self._tap).http_engine
+
+    @property
+    def project_index(self) -> AccountIndex:
+        """Return the projects of each account, shared by all streams."""
+        return cast("TapDBT", self._tap).project_index
+
+    @property
+    def job_index(self) -> AccountIndex:
+        """Return the jobs of each account, shared by all streams."""
+        return cast("TapDBT", self._tap).job_index
+
+    @property
+    def scheduler(self) -> StreamScheduler:
+        """Return the scheduler of the streams synced concurrently."""
+        return cast("TapDBT", self._tap).scheduler
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the per-account circuit breaker shared by all streams."""
+        return cast("TapDBT", self._tap).circuit_breaker
+
+    @property
+    def progress(self) -> ProgressReporter:
+        """Return the progress reporter shared by all streams."""
+        return cast("TapDBT", self._tap).progress
+
+    @contextlib.contextmanager
+    def account_request(self, context: Context | None) -> Iterator[None]:
+        """Count the outcome of a request against the circuit of its account.
+
+        Args:
+            context: Stream partition or context dictionary.
+
+        Raises:
+            AccountCircuitOpenError: If the circuit of the account is open, before
+                the request is sent.
+        """
+        account_id = (context or {}).get("account_id")
+        if account_id is None:
+            yield
+            return
+
+        breaker = self.circuit_breaker
+        breaker.check(account_id)
+        try:
+            yield
+        except Exception as e:
+            if breaker.record_failure(account_id, e):
+                self.logger.warning(
+                    "Opening the circuit of account %s, its remaining partitions "
+                    "are skipped: %s",
+                    account_id,
+                    breaker.describe(account_id),
+                )
+            raise
+        breaker.record_success(account_id)
+
+    def prefetch(self, context: Context | None, offset: int | None = None) -> None:
+        """Start requesting a page of this stream in the background.
+
+        Does nothing unless the async HTTP engine is enabled. The response is picked
+        up when the stream requests the same URL later on.
+
+        Args:
+            context: Stream partition or context dictionary.
+            offset: Offset of the page to request, or None for the first page.
+        """
+        engine = self.http_engine
+        if engine is None:
+            return
+
+        account_id = (context or {}).get("account_id")
+        if account_id is not None and self.circuit_breaker.is_open(account_id):
+            return
+
+        page = (
+            OffsetPaginator(start_value=offset, page_size=self.config["page_size"])
+            if offset is not None
+            else self.get_new_paginator() or SinglePagePaginator()
+        )
+        request = self.authenticator(self._prepare_request(context=context, page=page))
+        cache = self.response_cache
+        if (
+            cache is not None
+            and self.cache_ttl
+            and cache.is_fresh(
+                request,
+                self.cache_ttl,
+            )
+        ):
+            return
+        engine.prefetch(request)
+
+    def prefetch_next(
+        self,
+        response: requests.Response,
+        context: Context | None,
+    ) -> None:
+        """Prefetch the requests expected to follow a response.
+
+        Args:
+            response: A successful response of this stream.
+            context: Stream partition or context dictionary.
+        """
+
+    @override
+    def _request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        context: Context | None,
+    ) -> requests.Response:
+        cache = self.response_cache if self.cache_ttl else None
+        if cache is not None:
+            prepared_request = self.authenticator(prepared_request)
+            cached = cache.get(prepared_request, self.cache_ttl)
+            if cached is not None:
+                self.logger.debug("Using cached response to %s", prepared_request.url)
+                self.progress.update(
+                    self.logger,
+                    self.name,
+                    context,
+                    *page_position(cached),
+                )
+                return cached
+
+        engine = self.http_engine
+        with self.account_request(context):
+            if engine is None:
+                with self.scheduler.request_slot():
+                    response = super()._request(prepared_request, context)
+            else:
+                authenticated_request = self.authenticator(prepared_request)
+                with self.scheduler.request_slot():
+                    response = engine.send(authenticated_request)
+                self._write_request_duration_log(
+                    endpoint=self.path,
+                    response=response,
+                    context=context,
+                    extra_tags=None,
+                )
+                self.validate_response(response)
+        if cache is not None:
+            cache.put(response)
+        if engine is not None:
+            with resumed():
+                self.prefetch_next(response, context)
+        self.progress.update(self.logger, self.name, context, *page_position(response))
+        return response
+
+    @override
+    def request_decorator(self, func: RequestFunc) -> RequestFunc:
+        """Let other streams run while waiting on a request and its retries."""
+        decorated = super().request_decorator(func)
+
+        @functools.wraps(decorated)
+        def request(
+            prepared_request: requests.PreparedRequest,
+            context: Context | None,
+        ) -> requests.Response:
+            with blocking():
+                return decorated(prepared_request, context)
+
+        return request
+
+    @override
+    def request_records(self, context: Context | None) -> Iterable[Record]:
+        """Request records, fetching the next page while this one is processed.
+
+        With ``pipelined_pagination``, pages are requested in a background thread
+        which keeps at most a page of records ahead of the stream. The thread stops
+        once the stream stops reading records, and its errors are raised by the
+        stream.
+        """
+        if not self.config.get("pipelined_pagination") or self.http_engine is not None:
+            yield from self._request_records(context)
+            return
+
+        pipeline = ordered_chain(
+            self._request_records,
+            [context],
+            1,
+            self.config["page_size"],
+        )
+        try:
+            for _, records in pipeline:
+                yield from records
+        finally:
+            pipeline.close()
+
+    def _request_records(self, context: Context | None) -> Iterable[Record]:
+        """Request records one page after the other."""
+        return super().request_records(context)
+
+    def get_pruned_properties(self) -> frozenset[str] | None:
+        """Return the top-level properties records are pruned to.
+
+        Returns:
+            The selected properties plus the keys the stream needs internally, or
+            None if all properties are selected or the stream is not selected.
+        """
+        if not self.selected:
+            return None
+
+        properties = self.schema["properties"]
+        selected = {
+            name for name in properties if self.mask.get(("properties", name), True)
+        }
+        if len(selected) == len(properties):
+            return None
+
+        replication_key = (self.replication_key,) if self.replication_key else ()
+        return frozenset(
+            {
+                *selected,
+                *self.primary_keys,  # ty: ignore[not-iterable]
+                *replication_key,
+                *self.required_properties,
+            },
+        )
+
+    @override
+    def parse_response(self, response: requests.Response) -> Iterable[dict[str, Any]]:
+        """Parse records, dropping unselected properties right away.
+
+        Wide records like runs and jobs are pruned before post-processing, type
+        conformance and serialization, so their cost scales with the selected
+        properties only.
+        """
+        records = extract_jsonpath(self.records_jsonpath, response_json(response))
+        keep = self.get_pruned_properties()
+        if keep is None:
+            yield from records
+            return
+
+        for record in records:
+            yield {key: value for key, value in record.items() if key in keep}
+
+    def send_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        context: Context | None = None,
+        authenticate: bool = True,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Send a request outside of pagination, with the stream's retries.
+
+        Args:
+            method: The HTTP method.
+            url: The full URL.
+            context: Stream partition or context dictionary of the request.
+            authenticate: Whether to send the API token.
+            stream: Whether to stream the response body instead of reading it.
+
+        Returns:
+            The validated response.
+        """
+        request = (
+            self.build_prepared_request(
+                method=method, url=url, headers=self.http_headers
+            )
+            if authenticate
+            # Prepared outside the session, which would add the authenticator
+            else requests.Request(
+                method,
+                url,
+                headers={"User-Agent": self.user_agent},
+            ).prepare()
+        )
+
+        def send(
+            request: requests.PreparedRequest,
+            context: Context | None,
+        ) -> requests.Response:
+            with self.account_request(context), self.scheduler.request_slot():
+                response = self.requests_session.send(
+                    request,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+                self.validate_response(response)
+            return response
+
+        return self.request_decorator(send)(request, context)
+
+    def _get_batch_writer(self, batch_config: BatchConfig) -> RotatingBatchWriter:
+        if self._batch_writer is None:
+            self._batch_writer = RotatingBatchWriter(
+                self.tap_name,
+                self.name,
+                batch_config,
+                max_bytes=self.config.get("batch_file_max_bytes"),
+            )
+        return self._batch_writer
+
+    def flush_batches(self) -> None:
+        """Write BATCH messages for the open batch files of this stream and children.
+
+        Child streams are synced once per parent record, so their batch files are
+        kept open across child contexts and only closed by their parent stream.
+        """
+        for child in self.child_streams:
+            if isinstance(child, DBTStream):
+                child.flush_batches()
+
+        if self._batch_writer is not None and (manifest := self._batch_writer.flush()):
+            self._write_batch_message(
+                encoding=self._batch_writer.batch_config.encoding,
+                manifest=manifest,
+            )
+
+    @override
+    def get_batches(
+        self,
+        batch_config: BatchConfig,
+        context: Context | None = None,
+    ) -> Iterable[tuple[BaseBatchFileEncoding, list[str]]]:
+        """Write records to batch files rotated by record count or size.
+
+        Open child batch files are closed before each BATCH message of this stream,
+        so a STATE message never covers parent records whose children are not in a
+        batch file yet.
+        """
+        writer = self._get_batch_writer(batch_config)
+
+        for record in self._sync_records(context, write_messages=False):
+            if manifest := writer.write(record):
+                for child in self.child_streams:
+                    if isinstance(child, DBTStream):
+                        child.flush_batches()
+                yield batch_config.encoding, manifest
+
+        if self.parent_stream_type is None:
+            for child in self.child_streams:
+                if isinstance(child, DBTStream):
+                    child.flush_batches()
+            if manifest := writer.flush():
+                yield batch_config.encoding, manifest
+
+    @override
+    def _sync_batches(
+        self,
+        batch_config: BatchConfig,
+        context: Context | None = None,
+    ) -> None:
+        # Child streams leave state messages to their parent, which only writes them
+        # once the child batch files are closed
+        if self.parent_stream_type is None:
+            super()._sync_batches(batch_config, context)
+            return
+
+        with self.get_batch_counter() as counter:
+            for encoding, manifest in self.get_batches(batch_config, context):
+                counter.increment()
+                self._write_batch_message(encoding=encoding, manifest=manifest)
+
     def _resolve_openapi_ref(self) -> dict[str, Any]:
         schema = {"$ref": f"#/components/schemas/{self.openapi_ref}"}
         openapi = load_openapi(self.api_version)
@@ -78,9 +556,18 @@ class DBTStream(RESTStream):
     def schema(self) -> dict[str, Any]:
         """Return the schema for this stream.
 
+        Schemas generated from the OpenAPI specs are cached on disk, unless
+        ``schema_cache`` is disabled.
+
         Returns:
             The schema for this stream.
         """
+        schema_cache = get_schema_cache(self.config)
+        if schema_cache is None:
+            return self._build_schema()
+        return schema_cache.get(self.name, self._build_schema)
+
+    def _build_schema(self) -> dict[str, Any]:
         openapi_response = self._resolve_openapi_ref()
 
         def append_null_nested(schema: dict[str, Any]) -> dict[str, Any]:
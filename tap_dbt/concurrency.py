@@ -0,0 +1,279 @@
+"""Helpers to run blocking API calls concurrently."""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Iterator
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+_PUT_TIMEOUT = 0.1
+
+_local = threading.local()
+
+
+class StreamSyncCancelledError(Exception):
+    """Raised in a stream synced concurrently once another stream failed."""
+
+
+class StreamScheduler:
+    """Syncs independent streams in threads which take turns running SDK code.
+
+    A stream thread holds the scheduler lock while it processes records, updates
+    state and writes messages, and only releases it in :func:`blocking` sections,
+    while it waits on the API. Streams therefore overlap their requests, but never
+    touch the shared state or stdout at the same time. Requests of all streams and
+    their worker threads are capped by a shared semaphore.
+    """
+
+    def __init__(self, max_streams: int, max_requests: int) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_streams: Maximum number of streams synced at once.
+            max_requests: Maximum number of requests in flight, across streams.
+        """
+        self.max_streams = max_streams
+        self._lock = threading.Lock()
+        self._requests = threading.BoundedSemaphore(max_requests)
+        self._cancelled = threading.Event()
+
+    @contextlib.contextmanager
+    def request_slot(self) -> Iterator[None]:
+        """Wait for a free request slot, and hold it while sending a request."""
+        with self._requests:
+            yield
+
+    def run(self, tasks: Iterable[Callable[[], None]]) -> None:
+        """Run the sync of each stream, up to ``max_streams`` at once.
+
+        Once a task fails, the others stop at their next request, and the first
+        error is raised when they all ended.
+
+        Args:
+            tasks: Functions syncing a stream each.
+        """
+        with ThreadPoolExecutor(
+            self.max_streams,
+            thread_name_prefix="tap-dbt-stream",
+        ) as executor:
+            futures = [executor.submit(self._run, task) for task in tasks]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            if any(future.exception() for future in done):
+                self._cancelled.set()
+            wait(futures)
+
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None and not isinstance(error, StreamSyncCancelledError):
+                raise error
+
+    def _run(self, task: Callable[[], None]) -> None:
+        with self._lock:
+            self.check_cancelled()
+            _local.scheduler = self
+            try:
+                task()
+            finally:
+                _local.scheduler = None
+
+    def check_cancelled(self) -> None:
+        """Stop the current stream if another stream failed.
+
+        Raises:
+            StreamSyncCancelledError: If another stream failed.
+        """
+        if self._cancelled.is_set():
+            errmsg = "Another stream failed"
+            raise StreamSyncCancelledError(errmsg)
+
+
+@contextlib.contextmanager
+def blocking() -> Iterator[None]:
+    """Let other streams run while the current stream thread waits.
+
+    Does nothing outside of stream threads of a :class:`StreamScheduler`, or if the
+    current thread already left the scheduler lock.
+    """
+    scheduler: StreamScheduler | None = getattr(_local, "scheduler", None)
+    if scheduler is None:
+        yield
+        return
+
+    _local.scheduler = None
+    _local.waiting = scheduler
+    scheduler._lock.release()  # noqa: SLF001
+    try:
+        yield
+    finally:
+        scheduler._lock.acquire()  # noqa: SLF001
+        _local.scheduler = scheduler
+        _local.waiting = None
+    scheduler.check_cancelled()
+
+
+@contextlib.contextmanager
+def resumed() -> Iterator[None]:
+    """Take the scheduler lock back in a :func:`blocking` section of a stream thread.
+
+    Used to process a response as soon as it arrives, within a request that may
+    still be retried.
+    """
+    scheduler: StreamScheduler | None = getattr(_local, "waiting", None)
+    if scheduler is None:
+        yield
+        return
+
+    with scheduler._lock:  # noqa: SLF001
+        _local.scheduler = scheduler
+        _local.waiting = None
+        try:
+            yield
+        finally:
+            _local.scheduler = None
+            _local.waiting = scheduler
+
+
+def ordered_map(
+    func: Callable[[_T], _R],
+    items: Iterable[_T],
+    max_workers: int,
+) -> Iterator[_R]:
+    """Apply a function to items in a thread pool, yielding results in input order.
+
+    At most ``max_workers`` results are computed ahead of the consumer, so memory
+    stays bounded however many items there are. Pending calls are cancelled if the
+    consumer stops iterating early.
+
+    Args:
+        func: The function to apply.
+        items: The function arguments.
+        max_workers: Maximum number of concurrent calls.
+
+    Yields:
+        The result of each call, in the same order as ``items``.
+    """
+    iterator = iter(items)
+    pending: deque[Future[_R]] = deque()
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="tap-dbt") as executor:
+        try:
+            pending.extend(
+                executor.submit(func, item)
+                for item in itertools.islice(iterator, max_workers)
+            )
+            while pending:
+                with blocking():
+                    result = pending.popleft().result()
+                pending.extend(
+                    executor.submit(func, item)
+                    for item in itertools.islice(iterator, 1)
+                )
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class _Producer(Generic[_T, _R]):
+    """Results of one item, produced in a thread into a bounded queue."""
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        func: Callable[[_T], Iterable[_R]],
+        item: _T,
+        buffer_size: int,
+    ) -> None:
+        self.item = item
+        self._queue: queue.Queue[tuple[bool, _R | BaseException | None]] = queue.Queue(
+            buffer_size
+        )
+        self._cancelled = threading.Event()
+        executor.submit(self._produce, func, item)
+
+    def _put(self, done: bool, value: _R | BaseException | None) -> bool:  # noqa: FBT001
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put((done, value), timeout=_PUT_TIMEOUT)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def _produce(self, func: Callable[[_T], Iterable[_R]], item: _T) -> None:
+        try:
+            for result in func(item):
+                if not self._put(False, result):  # noqa: FBT003
+                    return
+        except BaseException as e:  # noqa: BLE001
+            self._put(True, e)  # noqa: FBT003
+        else:
+            self._put(True, None)  # noqa: FBT003
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def __iter__(self) -> Iterator[_R]:
+        while True:
+            with blocking():
+                done, value = self._queue.get()
+            if isinstance(value, BaseException):
+                raise value
+            if done:
+                return
+            yield value  # type: ignore[misc]
+
+
+def ordered_chain(
+    func: Callable[[_T], Iterable[_R]],
+    items: Iterable[_T],
+    max_workers: int,
+    buffer_size: int,
+) -> Generator[tuple[_T, Iterator[_R]], None, None]:
+    """Produce the results of several items concurrently, consuming them in order.
+
+    Up to ``max_workers`` items are produced at once in a thread pool, each keeping
+    at most ``buffer_size`` results ahead of the consumer, so memory stays bounded
+    however many results an item has. Each item is yielded with an iterator over its
+    results, which should be consumed before moving on to the next item; results
+    left unconsumed are discarded.
+
+    Args:
+        func: The function returning the results of an item.
+        items: The items.
+        max_workers: Maximum number of items produced at once.
+        buffer_size: Maximum number of results buffered per item.
+
+    Yields:
+        Each item and an iterator over its results, in the same order as ``items``.
+    """
+    iterator = iter(items)
+    pending: deque[_Producer[_T, _R]] = deque()
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="tap-dbt") as executor:
+        try:
+            pending.extend(
+                _Producer(executor, func, item, buffer_size)
+                for item in itertools.islice(iterator, max_workers)
+            )
+            while pending:
+                producer = pending[0]
+                yield producer.item, iter(producer)
+                pending.popleft().cancel()
+                pending.extend(
+                    _Producer(executor, func, item, buffer_size)
+                    for item in itertools.islice(iterator, 1)
+                )
+        finally:
+            for producer in pending:
+                producer.cancel()
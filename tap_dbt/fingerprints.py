@@ -0,0 +1,204 @@
+"""Content fingerprints used to skip unchanged records in full-table streams."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from singer_sdk.helpers.types import Context, Record
+
+
+def record_key(record: Record, primary_keys: Sequence[str]) -> str:
+    """Return a string key for a record built from its primary key values.
+
+    The key is the JSON-encoded list of primary key values, so it can be decoded back
+    into typed values when emitting tombstones.
+
+    Args:
+        record: The record.
+        primary_keys: The stream primary keys.
+
+    Returns:
+        The record key.
+    """
+    return json.dumps([record.get(key) for key in primary_keys], separators=(",", ":"))
+
+
+def record_fingerprint(record: Record) -> str:
+    """Return a compact content hash of a record.
+
+    Args:
+        record: The record.
+
+    Returns:
+        A 16 character hexadecimal digest.
+    """
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+def partition_key(context: Context | None) -> str:
+    """Return a string key for a stream partition.
+
+    Args:
+        context: The stream partition context.
+
+    Returns:
+        The partition key.
+    """
+    return json.dumps(dict(context or {}), sort_keys=True)
+
+
+def fingerprint_file_path(config: Mapping[str, Any]) -> Path | None:
+    """Return the fingerprint file of this tap process, if one is configured.
+
+    Each shard gets its own file, so shard processes sharing a
+    ``fingerprint_store_path`` never overwrite each other's fingerprints.
+
+    Args:
+        config: The tap configuration.
+
+    Returns:
+        The path of the fingerprint file, or None to keep fingerprints in state.
+    """
+    path = config.get("fingerprint_store_path")
+    if not path:
+        return None
+
+    path = Path(path)
+    if config.get("shard_count", 1) > 1:
+        shard_index = config.get("shard_index", 0)
+        path = path.with_name(f"{path.stem}.shard-{shard_index}{path.suffix}")
+    return path
+
+
+class FingerprintFile:
+    """Fingerprints persisted in a local JSON file instead of the tap state.
+
+    The file is only read once per process and every write replaces it atomically.
+    Each partition entry keeps the fingerprints of the last two writes, tagged with a
+    generation id. The generation id is also stored in the tap state, and only the
+    entry matching the state the target last acknowledged is trusted, so fingerprints
+    written by a sync whose STATE message never reached the target are ignored.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the fingerprint file.
+
+        Args:
+            path: Location of the JSON file. It is created on first write.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: dict[str, dict[str, dict[str, Any]]] | None = None
+
+    def _load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text())
+            except FileNotFoundError:
+                self._data = {}
+        return self._data
+
+    def get(
+        self,
+        stream_name: str,
+        partition: str,
+        generation: str | None,
+    ) -> dict[str, str]:
+        """Return the fingerprints of a stream partition.
+
+        Args:
+            stream_name: The stream name.
+            partition: A key identifying the stream partition.
+            generation: The fingerprint generation recorded in the tap state.
+
+        Returns:
+            A mapping of record keys to fingerprints, empty if no entry matches the
+            given generation.
+        """
+        if generation is None:
+            return {}
+
+        with self._lock:
+            entry = self._load().get(stream_name, {}).get(partition, {})
+
+        for candidate in (entry, entry.get("previous", {})):
+            if candidate.get("generation") == generation:
+                return candidate["fingerprints"]  # type: ignore[no-any-return]
+        return {}
+
+    def put(
+        self,
+        stream_name: str,
+        partition: str,
+        fingerprints: dict[str, str],
+        committed_generation: str | None,
+    ) -> str:
+        """Store new fingerprints for a stream partition and write the file.
+
+        The fingerprints matching ``committed_generation`` are kept next to the new
+        ones, in case the new generation never makes it into the target's state.
+
+        Args:
+            stream_name: The stream name.
+            partition: A key identifying the stream partition.
+            fingerprints: A mapping of record keys to fingerprints.
+            committed_generation: The generation currently recorded in the tap state.
+
+        Returns:
+            The generation id of the new fingerprints.
+        """
+        generation = uuid.uuid4().hex
+
+        with self._lock:
+            data = self._load()
+            entry = data.setdefault(stream_name, {}).get(partition, {})
+            previous = next(
+                (
+                    {
+                        "generation": candidate["generation"],
+                        "fingerprints": candidate["fingerprints"],
+                    }
+                    for candidate in (entry, entry.get("previous", {}))
+                    if committed_generation is not None
+                    and candidate.get("generation") == committed_generation
+                ),
+                None,
+            )
+            data[stream_name][partition] = {
+                "generation": generation,
+                "fingerprints": fingerprints,
+                "previous": previous or {},
+            }
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as tmp:
+                json.dump(data, tmp, separators=(",", ":"))
+            Path(tmp_path).replace(self.path)
+
+        return generation
+
+
+@cache
+def get_fingerprint_file(path: Path) -> FingerprintFile:
+    """Return the fingerprint file shared by all streams of this process.
+
+    Args:
+        path: Location of the JSON file.
+
+    Returns:
+        The shared fingerprint file.
+    """
+    return FingerprintFile(path)
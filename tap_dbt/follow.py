@@ -0,0 +1,160 @@
+"""Follow mode, polling the runs stream for runs finishing after a sync."""
+
+from __future__ import annotations
+
+import contextlib
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from tap_dbt.circuit import API_ERRORS, AccountCircuitOpenError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from singer_sdk.helpers.types import Context
+
+    from tap_dbt.streams import RunsStream
+
+
+@dataclass
+class _Schedule:
+    partition: Context
+    due: float
+    interval: float
+
+
+@contextlib.contextmanager
+def _stop_on_sigterm() -> Iterator[None]:
+    """Stop following on SIGTERM like on Ctrl-C, so the last state is written."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def stop(signum: int, frame: Any) -> None:  # noqa: ANN401
+        _ = signum, frame
+        raise KeyboardInterrupt
+
+    previous = signal.signal(signal.SIGTERM, stop)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+class RunsFollower:
+    """Polls each partition of the runs stream from its bookmark, at its own pace.
+
+    The process, its HTTP sessions and the stream schemas stay warm between polls.
+    A partition is polled again ``min_interval`` seconds after a poll that moved its
+    bookmark or its runs in progress. The interval doubles with every idle poll, up
+    to ``max_interval`` seconds, and failed polls wait ``max_interval`` seconds.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        stream: RunsStream,
+        *,
+        min_interval: float,
+        max_interval: float,
+        duration: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the follower.
+
+        Args:
+            stream: The runs stream, after its first sync.
+            min_interval: Seconds between polls of an active partition.
+            max_interval: Maximum seconds between polls of an idle partition.
+            duration: Seconds after which to stop following, or 0 to follow until
+                interrupted.
+            clock: Function returning monotonic seconds.
+            sleep: Function sleeping for a number of seconds.
+        """
+        self.stream = stream
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.duration = duration
+        self._clock = clock
+        self._sleep = sleep
+
+    def _activity(self, partition: Context) -> tuple[Any, ...]:
+        state = self.stream.get_context_state(partition)
+        return (
+            state.get("replication_key_value"),
+            tuple(state.get("in_flight_run_ids", ())),
+        )
+
+    def poll(self, partition: Context) -> bool:
+        """Sync the runs of a partition finished since its bookmark.
+
+        Args:
+            partition: The partition.
+
+        Returns:
+            True if the bookmark or the runs in progress of the partition changed.
+        """
+        before = self._activity(partition)
+        self.stream.sync(partition)
+        self.stream.finalize_state_progress_markers()
+        return self._activity(partition) != before
+
+    def run(self, after_poll: Callable[[], None] | None = None) -> None:
+        """Follow the stream until ``duration`` elapses or the process is stopped.
+
+        Args:
+            after_poll: Called after every round of due polls.
+        """
+        start = self._clock()
+        deadline = start + self.duration if self.duration > 0 else None
+        schedules = [
+            _Schedule(partition, start + self.min_interval, self.min_interval)
+            for partition in self.stream.partitions
+        ]
+        if not schedules:
+            return
+
+        self.stream.logger.info(
+            "Following stream '%s' for %d partitions",
+            self.stream.name,
+            len(schedules),
+        )
+        with contextlib.suppress(KeyboardInterrupt), _stop_on_sigterm():
+            while True:
+                next_due = min(schedule.due for schedule in schedules)
+                if deadline is not None and next_due > deadline:
+                    break
+                self._sleep(max(next_due - self._clock(), 0))
+
+                for schedule in schedules:
+                    if schedule.due <= self._clock():
+                        self._poll(schedule)
+                if after_poll is not None:
+                    after_poll()
+
+        self.stream.logger.info("Stopped following stream '%s'", self.stream.name)
+
+    def _poll(self, schedule: _Schedule) -> None:
+        partition = schedule.partition
+        try:
+            active = self.poll(partition)
+        except (AccountCircuitOpenError, *API_ERRORS):
+            self.stream.logger.exception(
+                "Failed to poll stream '%s' for %s, retrying in %d seconds",
+                self.stream.name,
+                partition,
+                self.max_interval,
+            )
+            # The next poll is the next attempt, even if the circuit opened
+            self.stream.circuit_breaker.reset(partition["account_id"])
+            schedule.interval = self.max_interval
+        else:
+            schedule.interval = (
+                self.min_interval
+                if active
+                else min(schedule.interval * 2, self.max_interval)
+            )
+        schedule.due = self._clock() + schedule.interval
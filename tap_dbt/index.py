@@ -0,0 +1,60 @@
+"""In-memory index of records listed once per dbt Cloud account."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from singer_sdk.helpers.types import Record
+
+
+class AccountIndex:
+    """Records of an account-level endpoint, fetched at most once per account.
+
+    The ``projects`` stream and project-scoped streams all read projects from an
+    index, and the ``jobs`` stream and job partitions of ``runs`` read jobs from
+    another, so each endpoint of an account is paged once whichever of them is synced
+    first, and not at all if none of them is selected.
+    """
+
+    def __init__(self, fetch: Callable[[str], Iterable[Record]]) -> None:
+        """Initialize the index.
+
+        Args:
+            fetch: Function returning the records of an account from the API.
+        """
+        self._fetch = fetch
+        self._records: dict[str, list[Record]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account_id: str) -> list[Record]:
+        """Return the records of an account, fetching them on first use.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+
+        Returns:
+            The records.
+        """
+        with self._lock:
+            account_lock = self._locks.setdefault(account_id, threading.Lock())
+
+        with account_lock:
+            if account_id not in self._records:
+                self._records[account_id] = list(self._fetch(account_id))
+            return self._records[account_id]
+
+    def get_ids(self, account_id: str) -> list[int]:
+        """Return the record IDs of an account, fetching them on first use.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+
+        Returns:
+            The record IDs.
+        """
+        return [record["id"] for record in self.get(account_id)]
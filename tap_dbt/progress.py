@@ -0,0 +1,141 @@
+"""Progress and ETA of paginated requests, from the pagination totals of responses."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from singer_sdk.metrics import get_metrics_logger
+
+from tap_dbt.fingerprints import partition_key
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Callable
+
+    from singer_sdk.helpers.types import Context
+
+
+@dataclass
+class _Progress:
+    started: float
+    last_logged: float
+    fetched: int = 0
+    total: int = 0
+    logged: bool = False
+
+
+class ProgressReporter:
+    """Records fetched so far out of the total announced by the API, per partition.
+
+    Each page of an offset-paginated endpoint carries the total number of records of
+    the request in ``extra.pagination.total_count``, so progress costs no extra
+    request. A log line and a ``sync_progress`` metric with the records fetched, the
+    total, the throughput and the ETA are written at most once every ``interval``
+    seconds per partition, and once more when a logged partition completes.
+    Partitions that complete within the interval are never logged.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the reporter.
+
+        Args:
+            interval: Minimum seconds between two reports of a partition, or 0 to
+                never report.
+            clock: Function returning monotonic seconds.
+        """
+        self.interval = interval
+        self._clock = clock
+        self._progress: dict[tuple[str, str], _Progress] = {}
+        self._lock = threading.Lock()
+        self._metrics_logger = get_metrics_logger()
+
+    def update(  # noqa: PLR0913
+        self,
+        logger: logging.Logger,
+        stream: str,
+        context: Context | None,
+        offset: int,
+        count: int,
+        total: int | None,
+    ) -> None:
+        """Count a page of records, reporting progress if it is due.
+
+        Args:
+            logger: The stream logger.
+            stream: The stream name.
+            context: Stream partition or context dictionary of the request.
+            offset: Offset of the page.
+            count: Number of records in the page.
+            total: Total number of records of the request, if known.
+        """
+        if self.interval <= 0 or total is None:
+            return
+
+        now = self._clock()
+        key = (stream, partition_key(context))
+        with self._lock:
+            progress = self._progress.setdefault(key, _Progress(now, now))
+            progress.fetched = max(progress.fetched, offset + count)
+            progress.total = total
+            done = progress.fetched >= total
+            if done:
+                del self._progress[key]
+            if not (
+                now - progress.last_logged >= self.interval
+                or (done and progress.logged)
+            ):
+                return
+            progress.last_logged = now
+            progress.logged = True
+
+        self._report(logger, stream, context, progress, now)
+
+    def _report(
+        self,
+        logger: logging.Logger,
+        stream: str,
+        context: Context | None,
+        progress: _Progress,
+        now: float,
+    ) -> None:
+        elapsed = now - progress.started
+        rate = progress.fetched / elapsed if elapsed > 0 else None
+        remaining = max(progress.total - progress.fetched, 0)
+        eta = remaining / rate if rate else None
+
+        logger.info(
+            "Progress of stream '%s' for %s: %d of %d records (%.1f%%), %s records/s, "
+            "ETA %s",
+            stream,
+            context,
+            progress.fetched,
+            progress.total,
+            100 * progress.fetched / progress.total if progress.total else 100.0,
+            f"{rate:.1f}" if rate is not None else "unknown",
+            datetime.timedelta(seconds=round(eta)) if eta is not None else "unknown",
+        )
+        point = {
+            "type": "gauge",
+            "metric": "sync_progress",
+            "value": progress.fetched,
+            "tags": {
+                "stream": stream,
+                "context": context,
+                "total": progress.total,
+                "records_per_second": rate,
+                "eta_seconds": eta,
+            },
+        }
+        self._metrics_logger.info(
+            "METRIC: %s",
+            json.dumps(point, default=str, separators=(",", ":")),
+        )
@@ -0,0 +1,278 @@
+"""Record HTTP exchanges of a sync to an archive, and replay them without network."""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import io
+import json
+import threading
+import time
+import urllib.parse
+import zipfile
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+REDACTED = "REDACTED"
+REDACTED_HEADERS = frozenset({"authorization", "cookie", "proxy-authorization"})
+"""Request headers never written to an archive."""
+
+# Bodies are stored decoded, so they are served without their transfer encodings
+_DROPPED_RESPONSE_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding"},
+)
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """Return the key a request is recorded and replayed under.
+
+    Query parameters are sorted, and bodies are reduced to a hash, so the key does not
+    depend on parameter order or hold request payloads.
+
+    Args:
+        request: The request.
+
+    Returns:
+        The request method, URL and body hash.
+    """
+    parts = urllib.parse.urlsplit(request.url or "")
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query)))
+    url = urllib.parse.urlunsplit(parts._replace(query=query))
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest() if body else "-"
+    return f"{request.method} {url} {digest}"
+
+
+def build_response(  # noqa: PLR0913
+    adapter: HTTPAdapter,
+    request: requests.PreparedRequest,
+    status: int,
+    reason: str,
+    headers: Mapping[str, str],
+    body: bytes,
+) -> requests.Response:
+    """Build a response whose body can be read whole or streamed from ``raw``.
+
+    Args:
+        adapter: The transport adapter building the response.
+        request: The request the response answers.
+        status: The response status code.
+        reason: The response reason phrase.
+        headers: The response headers. Encoding headers are dropped, since the body
+            is already decoded.
+        body: The decoded response body.
+
+    Returns:
+        The response.
+    """
+    raw = HTTPResponse(
+        body=io.BytesIO(body),
+        headers={
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in _DROPPED_RESPONSE_HEADERS
+        },
+        status=status,
+        reason=reason,
+        preload_content=False,
+        decode_content=False,
+    )
+    return adapter.build_response(request, raw)
+
+
+class HTTPArchive:
+    """Requests and responses of a sync, kept in a zip file.
+
+    Each exchange is stored as a JSON entry with the request, its redacted headers,
+    the response status and headers and the time it took, next to the deflated
+    response body. Exchanges with the same key are replayed in the order they were
+    recorded, and the last one is repeated once they run out.
+    """
+
+    def __init__(self, path: Path, *, record: bool) -> None:
+        """Open an archive.
+
+        Args:
+            path: The archive file.
+            record: Whether to start a new archive, or to read an existing one.
+        """
+        self.path = path
+        self.recording = record
+        self._lock = threading.Lock()
+        self._count = 0
+        self._entries: dict[str, deque[tuple[dict[str, Any], bytes]]] = defaultdict(
+            deque,
+        )
+
+        if record:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+            return
+
+        self._zip = zipfile.ZipFile(path)
+        for name in sorted(self._zip.namelist()):
+            if name.endswith(".json"):
+                entry = json.loads(self._zip.read(name))
+                body = self._zip.read(name.removesuffix(".json") + ".body")
+                self._entries[entry["key"]].append((entry, body))
+
+    def record(self, response: requests.Response, body: bytes) -> None:
+        """Add an exchange to the archive.
+
+        Args:
+            response: The response, with the request that was sent.
+            body: The decoded response body.
+        """
+        request = response.request
+        entry = {
+            "key": request_key(request),
+            "method": request.method,
+            "url": request.url,
+            "request_headers": {
+                name: REDACTED if name.lower() in REDACTED_HEADERS else value
+                for name, value in request.headers.items()
+            },
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "elapsed": response.elapsed.total_seconds(),
+        }
+        with self._lock:
+            self._count += 1
+            name = f"{self._count:08d}"
+            self._zip.writestr(f"{name}.json", json.dumps(entry, indent=2))
+            self._zip.writestr(f"{name}.body", body)
+
+    def replay(self, request: requests.PreparedRequest) -> tuple[dict[str, Any], bytes]:
+        """Return the next recorded exchange of a request.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The exchange entry and the response body.
+
+        Raises:
+            requests.exceptions.ConnectionError: If the request was never recorded.
+        """
+        key = request_key(request)
+        with self._lock:
+            exchanges = self._entries.get(key)
+            if not exchanges:
+                errmsg = f"Request was not recorded in {self.path}: {key}"
+                raise requests.exceptions.ConnectionError(errmsg, request=request)
+            return exchanges.popleft() if len(exchanges) > 1 else exchanges[0]
+
+    def close(self) -> None:
+        """Close the archive file, writing its index when recording."""
+        with self._lock:
+            self._zip.close()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter adding every exchange it sends to an archive."""
+
+    def __init__(self, archive: HTTPArchive) -> None:
+        """Initialize the adapter.
+
+        Args:
+            archive: The archive to record to.
+        """
+        super().__init__()
+        self.archive = archive
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> requests.Response:
+        """Send a request and record its response.
+
+        Streamed responses are read whole before being recorded, and served from
+        memory.
+        """
+        response = super().send(request, *args, **kwargs)
+        body = response.content
+        self.archive.record(response, body)
+
+        recorded = build_response(
+            self,
+            request,
+            response.status_code,
+            response.reason,
+            response.headers,
+            body,
+        )
+        recorded.elapsed = response.elapsed
+        return recorded
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter serving responses from an archive, without any network."""
+
+    def __init__(self, archive: HTTPArchive, *, latency: bool = False) -> None:
+        """Initialize the adapter.
+
+        Args:
+            archive: The archive to replay.
+            latency: Whether to wait as long as each recorded request took.
+        """
+        super().__init__()
+        self.archive = archive
+        self.latency = latency
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        *args: Any,  # noqa: ANN401, ARG002
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> requests.Response:
+        """Serve the next recorded response of a request."""
+        entry, body = self.archive.replay(request)
+        if self.latency:
+            time.sleep(entry["elapsed"])
+
+        response = build_response(
+            self,
+            request,
+            entry["status"],
+            entry["reason"],
+            entry["headers"],
+            body,
+        )
+        response.elapsed = datetime.timedelta(seconds=entry["elapsed"])
+        return response
+
+
+def create_archive(config: Mapping[str, Any]) -> HTTPArchive | None:
+    """Return the HTTP archive of the tap configuration, if there is one.
+
+    Args:
+        config: The tap configuration.
+
+    Returns:
+        The archive, or None when requests go to the API unrecorded.
+
+    Raises:
+        ValueError: If `http_archive_mode` is set without `http_archive_path`.
+    """
+    mode = config.get("http_archive_mode", "off")
+    if mode == "off":
+        return None
+
+    path = config.get("http_archive_path")
+    if not path:
+        errmsg = f"`http_archive_path` is required with `http_archive_mode` {mode}"
+        raise ValueError(errmsg)
+    return HTTPArchive(Path(path).expanduser(), record=mode == "record")
@@ -0,0 +1,190 @@
+"""On-disk cache of the responses of slowly changing endpoints."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from requests.adapters import HTTPAdapter
+
+from tap_dbt.replay import build_response, request_key
+from tap_dbt.schema_cache import default_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    import requests
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+SUFFIX = ".response"
+
+
+def response_cache_key(request: requests.PreparedRequest) -> str:
+    """Return the key a response is cached under.
+
+    The key covers the request method, URL and query parameters, and the API token
+    the request was authenticated with, so tokens never read each other's responses.
+    Only a digest of them is kept.
+
+    Args:
+        request: The authenticated request.
+
+    Returns:
+        A 32 character hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(request_key(request).encode())
+    digest.update(b"\n")
+    digest.update(request.headers.get("Authorization", "").encode())
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Successful GET responses, one file per request in a directory.
+
+    Entries are written to a temporary file first and moved in place, so concurrent
+    processes never read a partial entry. An entry is fresh for the TTL of the
+    stream reading it, counted from its file modification time. Once the entries
+    exceed ``max_bytes``, the oldest ones are removed. Entries that cannot be read
+    are ignored, and the request is sent.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: The cache directory.
+            max_bytes: Size of the entries above which the oldest are removed.
+            clock: Function returning the current epoch seconds.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._adapter = HTTPAdapter()
+        self._lock = threading.Lock()
+
+    def _path(self, request: requests.PreparedRequest) -> Path:
+        return self.directory / f"{response_cache_key(request)}{SUFFIX}"
+
+    def is_fresh(self, request: requests.PreparedRequest, ttl: float) -> bool:
+        """Whether a fresh response to a request is cached.
+
+        Args:
+            request: The authenticated request.
+            ttl: Seconds a cached response is fresh for.
+
+        Returns:
+            True if the response is cached and younger than ``ttl``.
+        """
+        try:
+            modified = self._path(request).stat().st_mtime
+        except OSError:
+            return False
+        return self._clock() - modified < ttl
+
+    def get(
+        self,
+        request: requests.PreparedRequest,
+        ttl: float,
+    ) -> requests.Response | None:
+        """Return the cached response to a request, if it is fresh.
+
+        Args:
+            request: The authenticated request.
+            ttl: Seconds a cached response is fresh for.
+
+        Returns:
+            The cached response, or None.
+        """
+        if request.method != "GET" or not self.is_fresh(request, ttl):
+            return None
+        try:
+            meta, _, body = self._path(request).read_bytes().partition(b"\n")
+            entry: dict[str, Any] = json.loads(meta)
+        except (OSError, ValueError):
+            return None
+        return build_response(
+            self._adapter,
+            request,
+            entry["status"],
+            entry["reason"],
+            entry["headers"],
+            body,
+        )
+
+    def put(self, response: requests.Response) -> None:
+        """Cache a response, if it is a successful response to a GET request.
+
+        Args:
+            response: The response, with the authenticated request that was sent.
+        """
+        request = response.request
+        if request.method != "GET" or response.status_code != HTTPStatus.OK:
+            return
+
+        entry = {
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+        }
+        data = json.dumps(entry).encode() + b"\n" + response.content
+        # The cache is an optimization, a read-only home must not fail syncs
+        with contextlib.suppress(OSError):
+            self._write(self._path(request), data)
+            with self._lock:
+                self._evict()
+
+    def _write(self, path: Path, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        Path(tmp_path).replace(path)
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+
+
+def get_response_cache(config: Mapping[str, Any]) -> ResponseCache | None:
+    """Return the response cache of the tap configuration, if it is enabled.
+
+    Args:
+        config: The tap configuration.
+
+    Returns:
+        The response cache, or None if ``response_cache`` is disabled.
+    """
+    if not config.get("response_cache"):
+        return None
+    directory = config.get("response_cache_dir")
+    return ResponseCache(
+        Path(directory).expanduser()
+        if directory
+        else default_cache_dir() / "responses",
+        config.get("response_cache_max_bytes", DEFAULT_MAX_BYTES),
+    )
@@ -0,0 +1,142 @@
+"""On-disk cache of the stream schemas generated from the bundled OpenAPI specs."""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import hashlib
+import importlib.metadata
+import importlib.resources
+import json
+import os
+import tempfile
+import threading
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+PACKAGE = "tap_dbt"
+
+
+def default_cache_dir() -> Path:
+    """Return the default directory of the schema cache.
+
+    Returns:
+        ``tap-dbt`` in ``$XDG_CACHE_HOME``, or in ``~/.cache``.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "tap-dbt"
+
+
+@cache
+def cache_key() -> str:
+    """Return the key of the schemas generated by this installation of the tap.
+
+    The key changes with the tap version, the bundled OpenAPI specs and the tap's
+    modules, so an upgrade or a local change never reads schemas of another build.
+
+    Returns:
+        The tap version and a 16 character hexadecimal digest.
+    """
+    try:
+        version = importlib.metadata.version("tap-dbt")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+
+    digest = hashlib.blake2b(digest_size=8)
+    package = importlib.resources.files(PACKAGE)
+    files = [
+        *(package / "schemas").iterdir(),
+        *package.iterdir(),
+    ]
+    for file in sorted(files, key=lambda file: file.name):
+        if file.name.endswith((".yaml", ".py")):
+            digest.update(file.name.encode())
+            digest.update(file.read_bytes())
+    return f"{version}-{digest.hexdigest()}"
+
+
+class SchemaCache:
+    """Stream schemas kept in a JSON file, one file per cache key.
+
+    Files of other keys are removed when the file is written. A file that cannot be
+    read is ignored, and schemas are generated again.
+    """
+
+    def __init__(self, directory: Path, key: str) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: The cache directory.
+            key: The cache key of this installation of the tap.
+        """
+        self.directory = directory
+        self.path = directory / f"schemas-{key}.json"
+        self._lock = threading.Lock()
+        try:
+            with self.path.open() as f:
+                self._schemas: dict[str, dict[str, Any]] = json.load(f)
+        except (OSError, ValueError):
+            self._schemas = {}
+
+    def get(
+        self,
+        name: str,
+        build: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Return a cached schema, generating and caching it if it is missing.
+
+        Args:
+            name: The schema name.
+            build: Function generating the schema.
+
+        Returns:
+            A copy of the schema, which the caller may modify.
+        """
+        with self._lock:
+            if name in self._schemas:
+                return copy.deepcopy(self._schemas[name])
+
+        schema = build()
+        with self._lock:
+            self._schemas[name] = copy.deepcopy(schema)
+            # The cache is an optimization, a read-only home must not fail syncs
+            with contextlib.suppress(OSError):
+                self._write()
+        return schema
+
+    def _write(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp:
+            json.dump(self._schemas, tmp, separators=(",", ":"))
+        Path(tmp_path).replace(self.path)
+
+        for stale in self.directory.glob("schemas-*.json"):
+            if stale != self.path:
+                stale.unlink(missing_ok=True)
+
+
+@cache
+def _get_schema_cache(directory: Path) -> SchemaCache:
+    return SchemaCache(directory, cache_key())
+
+
+def get_schema_cache(config: Mapping[str, Any]) -> SchemaCache | None:
+    """Return the schema cache shared by all streams of this process.
+
+    Args:
+        config: The tap configuration.
+
+    Returns:
+        The schema cache, or None if ``schema_cache`` is disabled.
+    """
+    if not config.get("schema_cache", True):
+        return None
+    directory = config.get("schema_cache_dir")
+    return _get_schema_cache(
+        Path(directory).expanduser() if directory else default_cache_dir(),
+    )
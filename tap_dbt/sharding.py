@@ -0,0 +1,155 @@
+"""Deterministic assignment of dbt Cloud accounts to tap shards."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+
+def _shard_weight(account_id: str, shard: int) -> bytes:
+    key = f"{account_id}:{shard}".encode()
+    return hashlib.blake2b(key, digest_size=8).digest()
+
+
+def shard_for_account(account_id: str | int, shard_count: int) -> int:
+    """Return the shard that owns an account.
+
+    Uses rendezvous (highest random weight) hashing, so the assignment of an account
+    never depends on which other accounts are configured, and changing the shard count
+    only moves the accounts that land on the added or removed shard.
+
+    Args:
+        account_id: The dbt Cloud account ID.
+        shard_count: The total number of shards.
+
+    Returns:
+        The zero-based index of the owning shard.
+    """
+    return max(
+        range(shard_count), key=lambda shard: _shard_weight(str(account_id), shard)
+    )
+
+
+def validate_shard_config(config: Mapping[str, Any]) -> tuple[int, int]:
+    """Return the configured shard index and count.
+
+    Args:
+        config: The tap configuration.
+
+    Returns:
+        A ``(shard_index, shard_count)`` tuple.
+
+    Raises:
+        ValueError: If the shard settings are out of range.
+    """
+    shard_index: int = config.get("shard_index", 0)
+    shard_count: int = config.get("shard_count", 1)
+
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        errmsg = (
+            f"Invalid sharding configuration: shard_index={shard_index}, "
+            f"shard_count={shard_count}. "
+            "Expected shard_count >= 1 and 0 <= shard_index < shard_count."
+        )
+        raise ValueError(errmsg)
+
+    return shard_index, shard_count
+
+
+def owns_account(config: Mapping[str, Any], account_id: str | int) -> bool:
+    """Return whether the shard described by the tap config owns an account.
+
+    Args:
+        config: The tap configuration.
+        account_id: The dbt Cloud account ID.
+
+    Returns:
+        True if this shard should sync the account.
+    """
+    shard_index, shard_count = validate_shard_config(config)
+    if shard_count == 1:
+        return True
+    return shard_for_account(account_id, shard_count) == shard_index
+
+
+def filter_state(config: Mapping[str, Any], state: dict[str, Any]) -> dict[str, Any]:
+    """Drop partition bookmarks that belong to other shards.
+
+    Args:
+        config: The tap configuration.
+        state: A tap state dictionary, possibly merged from several shards.
+
+    Returns:
+        A copy of the state only containing this shard's partitions.
+    """
+    bookmarks: dict[str, Any] = {}
+    for stream_name, stream_state in state.get("bookmarks", {}).items():
+        stream_state = copy.deepcopy(stream_state)  # noqa: PLW2901
+        if "partitions" in stream_state:
+            stream_state["partitions"] = [
+                partition
+                for partition in stream_state["partitions"]
+                if "account_id" not in partition.get("context", {})
+                or owns_account(config, partition["context"]["account_id"])
+            ]
+        bookmarks[stream_name] = stream_state
+
+    return {**state, "bookmarks": bookmarks}
+
+
+def _partition_key(partition: dict[str, Any]) -> str:
+    return json.dumps(partition.get("context", {}), sort_keys=True)
+
+
+def _newer(candidate: dict[str, Any], current: dict[str, Any]) -> bool:
+    candidate_value = candidate.get("replication_key_value")
+    current_value = current.get("replication_key_value")
+    if candidate_value is None:
+        return False
+    if current_value is None:
+        return True
+    return str(candidate_value) > str(current_value)
+
+
+def merge_shard_states(states: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+    """Merge the final states of several shards into a single tap state.
+
+    Partition bookmarks are combined by context. If more than one shard reports the
+    same partition, the bookmark with the greatest replication key value wins.
+
+    Args:
+        states: The states emitted by each shard.
+
+    Returns:
+        A single state dictionary covering every shard.
+    """
+    merged: dict[str, dict[str, Any]] = {}
+    partitions: dict[str, dict[str, dict[str, Any]]] = {}
+
+    for state in states:
+        for stream_name, stream_state in state.get("bookmarks", {}).items():
+            merged_stream = merged.setdefault(stream_name, {})
+            stream_partitions = partitions.setdefault(stream_name, {})
+
+            for key, value in stream_state.items():
+                if key != "partitions":
+                    merged_stream.setdefault(key, value)
+
+            for partition in stream_state.get("partitions", []):
+                partition_key = _partition_key(partition)
+                current = stream_partitions.get(partition_key)
+                if current is None or _newer(partition, current):
+                    stream_partitions[partition_key] = partition
+
+    for stream_name, stream_partitions in partitions.items():
+        if stream_partitions:
+            merged[stream_name]["partitions"] = [
+                stream_partitions[key] for key in sorted(stream_partitions)
+            ]
+
+    return {"bookmarks": merged}
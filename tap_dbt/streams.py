@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import csv
 import datetime
+import io
+import itertools
 import json
+import shutil
 import sys
+import tempfile
+import time
+import urllib.parse
+from functools import cached_property
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Any, cast
+from typing import IO, TYPE_CHECKING, Any, cast
 
 from singer_sdk import typing as th
 from singer_sdk.pagination import (
@@ -16,7 +24,23 @@ from singer_sdk.pagination import (
 )
 from typing_extensions import override
 
-from tap_dbt.client import DBTStream
+from tap_dbt.artifacts import (
+    iter_manifest_nodes,
+    iter_run_results,
+    manifest_checksum,
+)
+from tap_dbt.circuit import API_ERRORS, AccountCircuitOpenError
+from tap_dbt.client import DBTStream, page_position, response_json
+from tap_dbt.concurrency import blocking, ordered_chain, ordered_map
+from tap_dbt.fingerprints import (
+    FingerprintFile,
+    fingerprint_file_path,
+    get_fingerprint_file,
+    partition_key,
+    record_fingerprint,
+    record_key,
+)
+from tap_dbt.sharding import owns_account
 
 if sys.version_info < (3, 11):
     from backports.datetime_fromisoformat import (  # ty: ignore[unresolved-import]
@@ -31,12 +55,42 @@ else:
     from typing_extensions import override
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Generator, Iterable, Iterator
 
     import requests
     from singer_sdk.helpers.types import Context, Record
 
 
+DIMENSION_CACHE_TTL = 60 * 60
+"""Default seconds the responses of slowly changing endpoints are cached for."""
+
+
+def older_than(start: datetime.datetime) -> Callable[[str], bool]:
+    """Return a test of whether an ISO 8601 timestamp is older than ``start``.
+
+    Timestamps with the same layout and UTC offset as ``start`` are compared as
+    strings, without parsing them. Other timestamps are parsed.
+
+    Args:
+        start: The timestamp to compare with.
+
+    Returns:
+        A function telling whether a timestamp string is older than ``start``.
+    """
+    start_text = start.isoformat()
+
+    def is_older(value: str) -> bool:
+        if (
+            len(value) == len(start_text)
+            and value[10] == start_text[10]
+            and value[-6:] == start_text[-6:]
+        ):
+            return value < start_text
+        return datetime.datetime.fromisoformat(value) < start
+
+    return is_older
+
+
 class _AccountBasedStream(DBTStream):
     """A stream that requires an account ID."""
 
@@ -48,6 +102,7 @@ class _AccountBasedStream(DBTStream):
             return [
                 {"account_id": account_id}
                 for account_id in cast("list[str]", self.config["account_ids"])
+                if owns_account(self.config, account_id)
             ]
 
         errmsg = (
@@ -57,6 +112,85 @@ class _AccountBasedStream(DBTStream):
         )
         raise ValueError(errmsg)
 
+    _failed_accounts: dict[str, str] | None = None
+
+    @override
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> Generator[Record, Any, Any]:
+        if context is not None or self.circuit_breaker.threshold <= 0:
+            # The SDK syncs a stream without partitions once without a context,
+            # which would request the URL path with its placeholder left in
+            if context is None and not self.partitions:
+                self.logger.info(
+                    "Skipping stream '%s', this shard owns none of the configured "
+                    "accounts",
+                    self.name,
+                )
+                return
+            yield from super()._sync_records(context, write_messages=write_messages)
+            return
+
+        # Partitions are synced one by one, so the failures of one account do not
+        # stop the partitions of the other accounts
+        for partition in self.partitions or []:
+            yield from self._sync_account(partition, write_messages=write_messages)
+
+    def _sync_account(
+        self,
+        partition: Context,
+        *,
+        write_messages: bool,
+    ) -> Generator[Record, Any, Any]:
+        account_id = partition["account_id"]
+        breaker = self.circuit_breaker
+
+        if breaker.is_open(account_id):
+            self.logger.warning(
+                "Skipping account %s of stream '%s', its circuit is open",
+                account_id,
+                self.name,
+            )
+            self.add_failed_account(account_id, breaker.describe(account_id))
+            return
+
+        try:
+            yield from super()._sync_records(partition, write_messages=write_messages)
+        except (AccountCircuitOpenError, *API_ERRORS) as e:
+            self.logger.exception(
+                "Failed to sync account %s of stream '%s', moving on to the next "
+                "account",
+                account_id,
+                self.name,
+            )
+            self.add_failed_account(account_id, str(e))
+
+    def add_failed_account(self, account_id: str, error: str) -> None:
+        """Remember an account skipped by this stream, for the end of sync summary.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+            error: Why the account was skipped.
+        """
+        if self._failed_accounts is None:
+            self._failed_accounts = {}
+        self._failed_accounts[account_id] = error
+
+    @override
+    def log_sync_costs(self) -> None:
+        """Also log the accounts this stream failed to sync."""
+        super().log_sync_costs()
+        for account_id, error in (self._failed_accounts or {}).items():
+            self.logger.warning(
+                "Stream '%s' skipped account %s: %s",
+                self.name,
+                account_id,
+                error,
+            )
+
     @override
     def get_new_paginator(self) -> BaseAPIPaginator:  # type: ignore[type-arg]
         """Return a new paginator instance for this stream."""
@@ -69,6 +203,30 @@ class _AccountBasedStream(DBTStream):
 
         return OffsetPaginator(start_value=0, page_size=page_size)
 
+    @override
+    def prefetch_next(
+        self,
+        response: requests.Response,
+        context: Context | None,
+    ) -> None:
+        """Prefetch the next pages and, after a first page, the next partitions."""
+        engine = self.http_engine
+        assert engine is not None  # noqa: S101
+
+        offset, _, total_count = page_position(response)
+        page_size: int = self.config["page_size"]
+
+        if total_count is not None:
+            end = min(total_count, offset + page_size * (engine.max_concurrency + 1))
+            for next_offset in range(offset + page_size, end, page_size):
+                self.prefetch(context, next_offset)
+
+        partitions = self.partitions
+        if offset == 0 and context in partitions:
+            start = partitions.index(context) + 1  # type: ignore[arg-type]
+            for partition in partitions[start : start + engine.max_concurrency]:
+                self.prefetch(partition)
+
     @override
     def get_url_params(
         self,
@@ -118,31 +276,172 @@ class AccountBasedIncrementalStream(_AccountBasedStream):
 
     @override
     def get_records(self, context: Context | None) -> Iterable[Record]:
-        starting_replication_key_value = self.get_starting_timestamp(context)
+        """Return records up to the bookmark, deciding page by page.
 
-        for record in self.request_records(context):
-            transformed_record = self.post_process(record, context)
-            if transformed_record is None:
-                # Record filtered out during post_process()
+        The listing is sorted by the replication key, so a page whose first and last
+        records are not older than the bookmark is passed whole, and only the page
+        crossing the bookmark is examined record by record. No further page is
+        requested once a record older than the bookmark is hit.
+        """
+        start = self.get_starting_timestamp(context)
+        records = self.request_records(context)
+        if start is None:
+            yield from self._post_process_page(records, context)
+            return
+
+        replication_key = cast("str", self.replication_key)
+        is_older = older_than(start)
+        page_size: int = self.config["page_size"]
+        records = iter(records)
+        # Pages are read whole, which never requests the page after them
+        for page in iter(lambda: list(itertools.islice(records, page_size)), []):
+            ends = (page[0][replication_key], page[-1][replication_key])
+            if None not in ends and not any(is_older(value) for value in ends):
+                yield from self._post_process_page(page, context)
                 continue
 
-            if (
-                starting_replication_key_value is not None
-                and record[self.replication_key] is not None
-            ):
-                record_last_received_datetime = datetime.datetime.fromisoformat(
-                    record[self.replication_key],
-                )
-
-                if record_last_received_datetime < starting_replication_key_value:
+            for index, record in enumerate(page):
+                value = record[replication_key]
+                if value is not None and is_older(value):
                     self.logger.info(
                         "Breaking after hitting a record with replication key %s < %s",
-                        record_last_received_datetime,
-                        starting_replication_key_value,
+                        value,
+                        start,
                     )
-                    break
+                    yield from self._post_process_page(page[:index], context)
+                    return
+            yield from self._post_process_page(page, context)
 
-            yield transformed_record
+    def _post_process_page(
+        self,
+        records: Iterable[Record],
+        context: Context | None,
+    ) -> Iterator[Record]:
+        for record in records:
+            transformed_record = self.post_process(record, context)
+            # Records may be filtered out during post_process()
+            if transformed_record is not None:
+                yield transformed_record
+
+
+class _ChangeDetectingStream(_AccountBasedStream):
+    """Account stream that can skip records which did not change since the last sync.
+
+    When ``skip_unchanged_records`` is enabled, a compact content hash of each record
+    is kept per account, in the stream state or in ``fingerprint_store_path``, and
+    only new or changed records are emitted. With ``emit_tombstones``, records that
+    are no longer returned by the API are emitted with ``_sdc_deleted_at`` set.
+
+    These endpoints hardly change, so their responses are cached with
+    ``response_cache``.
+    """
+
+    response_cache_ttl = DIMENSION_CACHE_TTL
+
+    @override
+    @cached_property
+    def schema(self) -> dict[str, Any]:
+        schema: dict[str, Any] = super().schema
+        if self.config.get("emit_tombstones"):
+            schema = {
+                **schema,
+                "properties": {
+                    **schema["properties"],
+                    "_sdc_deleted_at": {
+                        "type": ["string", "null"],
+                        "format": "date-time",
+                    },
+                },
+            }
+        return schema
+
+    @cached_property
+    def _fingerprint_file(self) -> FingerprintFile | None:
+        path = fingerprint_file_path(self.config)
+        return get_fingerprint_file(path) if path else None
+
+    def _get_fingerprints(self, context: Context | None) -> dict[str, str]:
+        state = self.get_context_state(context)
+        if self._fingerprint_file is not None:
+            return self._fingerprint_file.get(
+                self.name,
+                partition_key(context),
+                state.get("fingerprint_generation"),
+            )
+        return state.get("fingerprints", {})  # type: ignore[no-any-return]
+
+    def _set_fingerprints(
+        self,
+        context: Context | None,
+        fingerprints: dict[str, str],
+    ) -> None:
+        state = self.get_context_state(context)
+        if self._fingerprint_file is not None:
+            # The file only becomes authoritative once the target acknowledges the
+            # STATE message carrying the new generation id
+            state["fingerprint_generation"] = self._fingerprint_file.put(
+                self.name,
+                partition_key(context),
+                fingerprints,
+                state.get("fingerprint_generation"),
+            )
+        else:
+            state["fingerprints"] = fingerprints
+        self.state_manager.is_flushed = False
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[Record]:
+        if not self.config.get("skip_unchanged_records"):
+            yield from super().get_records(context)
+            return
+
+        previous = self._get_fingerprints(context)
+        current: dict[str, str] = {}
+        skipped = 0
+
+        for record in super().get_records(context):
+            key = record_key(record, self.primary_keys)
+            current[key] = record_fingerprint(record)
+            if previous.get(key) == current[key]:
+                skipped += 1
+                continue
+            yield record
+
+        self.logger.info("Skipped %d unchanged records", skipped)
+
+        if self.config.get("emit_tombstones"):
+            deleted_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            for key in previous.keys() - current.keys():
+                yield {
+                    **dict(zip(self.primary_keys, json.loads(key), strict=True)),
+                    "_sdc_deleted_at": deleted_at,
+                }
+
+        # Only remember the new fingerprints once the whole partition was synced
+        self._set_fingerprints(context, current)
+
+
+class _ProjectBasedStream(_AccountBasedStream):
+    """A stream for an endpoint scoped to a project of an account.
+
+    Partitions are accounts, and each partition fans out over the projects of the
+    account, taken from the tap's project index. Up to ``max_concurrent_requests``
+    projects are requested at once and their records are emitted in project order.
+    """
+
+    def _request_project(self, context: Context, project_id: int) -> list[Record]:
+        return list(self.request_records({**context, "project_id": project_id}))
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[Record]:
+        assert context is not None  # noqa: S101
+
+        for records in ordered_map(
+            lambda project_id: self._request_project(context, project_id),
+            self.project_index.get_ids(context["account_id"]),
+            self.config["max_concurrent_requests"],
+        ):
+            yield from records
 
 
 class AccountsStream(DBTStream):
@@ -151,9 +450,21 @@ class AccountsStream(DBTStream):
     name = "accounts"
     path = "/accounts"
     openapi_ref = "Account"
+    response_cache_ttl = DIMENSION_CACHE_TTL
 
+    @override
+    def post_process(
+        self,
+        row: Record,
+        context: Context | None = None,
+    ) -> Record | None:
+        """Only emit accounts owned by this shard."""
+        if not owns_account(self.config, row["id"]):
+            return None
+        return row
 
-class ConnectionsStream(_AccountBasedStream):
+
+class ConnectionsStream(_ChangeDetectingStream):
     """A stream for the projects endpoint."""
 
     name = "connections"
@@ -162,7 +473,37 @@ class ConnectionsStream(_AccountBasedStream):
     selected_by_default = False
 
 
-class EnvironmentsStream(_AccountBasedStream):
+class CredentialsStream(_ProjectBasedStream):
+    """A stream for the v3 project credentials endpoint."""
+
+    name = "credentials"
+    path = "/accounts/{account_id}/projects/{project_id}/credentials/"
+    openapi_ref = "CredentialsResponseList"
+    api_version = "v3"
+    selected_by_default = False
+
+    @override
+    def _resolve_openapi_ref(self) -> dict[str, Any]:
+        # The response is one of several adapter-specific schemas, merged here into
+        # a single object schema. Private fields such as refresh tokens are dropped.
+        schema = super()._resolve_openapi_ref()
+        properties: dict[str, Any] = {"id": {"type": "integer"}}
+        for variant in schema["oneOf"]:
+            for name, property_schema in variant["properties"].items():
+                if not name.startswith("_"):
+                    properties.setdefault(name, property_schema)
+        return {"type": "object", "properties": properties}
+
+    @override
+    def post_process(
+        self,
+        row: Record,
+        context: Context | None = None,
+    ) -> Record | None:
+        return {key: value for key, value in row.items() if not key.startswith("_")}
+
+
+class EnvironmentsStream(_ChangeDetectingStream):
     """A stream for the projects endpoint."""
 
     name = "environments"
@@ -171,6 +512,84 @@ class EnvironmentsStream(_AccountBasedStream):
     selected_by_default = False
 
 
+class _MatrixPaginator(OffsetPaginator):
+    """Offset paginator that also stops after a variable matrix, which has no pages."""
+
+    @override
+    def has_more(self, response: requests.Response) -> bool:
+        data = response_json(response).get("data")
+        return isinstance(data, list) and bool(data)
+
+
+class EnvironmentVariablesStream(_ProjectBasedStream):
+    """A stream for the v3 project-level environment variable endpoints.
+
+    The ``environment``, ``job`` and ``user`` endpoints each return the variables of
+    a whole project in a single response, either as a list of variables or as a
+    matrix of variable names by scope. Matrices are flattened into one record per
+    variable and scope, so variables are never requested per environment or job.
+    """
+
+    name = "environment_variables"
+    path = "/accounts/{account_id}/projects/{project_id}/environment-variables/{scope}/"
+    openapi_ref = "CustomEnvironmentVariableResponse"
+    api_version = "v3"
+    selected_by_default = False
+
+    scopes = ("environment", "job", "user")
+    required_properties = ("name", "scope", "type")
+
+    @override
+    @cached_property
+    def schema(self) -> dict[str, Any]:
+        schema: dict[str, Any] = super().schema
+        return {
+            **schema,
+            "properties": {
+                **schema["properties"],
+                "scope": {"type": ["string", "null"]},
+            },
+        }
+
+    @override
+    def get_new_paginator(self) -> BaseAPIPaginator:  # type: ignore[type-arg]
+        return _MatrixPaginator(start_value=0, page_size=self.config["page_size"])
+
+    @override
+    def parse_response(self, response: requests.Response) -> Iterable[Record]:
+        data = response_json(response).get("data")
+        if not isinstance(data, dict):
+            yield from super().parse_response(response)
+            return
+
+        # {"DBT_VAR": {"project": {"id": 1, "value": "a"}, "Prod": {...}}, ...}
+        for variable_name, cells in data.items():
+            for scope, cell in cells.items():
+                if not isinstance(cell, dict):
+                    continue
+                record = {key: value for key, value in cell.items() if key != "value"}
+                record.setdefault("display_value", cell.get("value"))
+                yield {**record, "name": variable_name, "scope": scope}
+
+    @override
+    def _request_project(self, context: Context, project_id: int) -> list[Record]:
+        records: dict[Any, Record] = {}
+        for scope in self.scopes:
+            for record in self.request_records(
+                {**context, "project_id": project_id, "scope": scope},
+            ):
+                record.setdefault("account_id", int(context["account_id"]))
+                record.setdefault("project_id", project_id)
+                if "type" not in record:
+                    is_default = record.get("scope") == "project"
+                    record["type"] = "project" if is_default else scope
+
+                # Project defaults are repeated in the matrix of every scope
+                key = record.get("id") or (record["name"], record["scope"], scope)
+                records.setdefault(key, record)
+        return list(records.values())
+
+
 class JobsStream(_AccountBasedStream):
     """A stream for the jobs endpoint."""
 
@@ -178,6 +597,24 @@ class JobsStream(_AccountBasedStream):
     path = "/accounts/{account_id}/jobs"
     openapi_ref = "Job"
 
+    def fetch_jobs(self, account_id: str) -> list[Record]:
+        """Request all jobs of an account.
+
+        Args:
+            account_id: The dbt Cloud account ID.
+
+        Returns:
+            The job records.
+        """
+        return list(super().get_records({"account_id": account_id}))
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[Record]:
+        # Read through the job index, which may already hold the jobs if runs are
+        # partitioned by job
+        assert context is not None  # noqa: S101
+        return self.job_index.get(context["account_id"])
+
 
 class ProjectsStream(_AccountBasedStream):
     """A stream for the projects endpoint."""
@@ -185,9 +622,28 @@ class ProjectsStream(_AccountBasedStream):
     name = "projects"
     path = "/accounts/{account_id}/projects"
     openapi_ref = "Project"
+    response_cache_ttl = DIMENSION_CACHE_TTL
 
+    def fetch_projects(self, account_id: str) -> list[Record]:
+        """Request all projects of an account.
 
-class RepositoriesStream(_AccountBasedStream):
+        Args:
+            account_id: The dbt Cloud account ID.
+
+        Returns:
+            The project records.
+        """
+        return list(super().get_records({"account_id": account_id}))
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[Record]:
+        # Read through the project index, which may already hold the projects if a
+        # project-scoped stream was synced first
+        assert context is not None  # noqa: S101
+        return self.project_index.get(context["account_id"])
+
+
+class RepositoriesStream(_ChangeDetectingStream):
     """A stream for the repositories endpoint."""
 
     name = "repositories"
@@ -196,14 +652,258 @@ class RepositoriesStream(_AccountBasedStream):
     selected_by_default = False
 
 
+IN_PROGRESS_RUN_STATUSES = frozenset({1, 2, 3})
+"""Statuses of queued, starting and running runs."""
+
+
 class RunsStream(AccountBasedIncrementalStream):
-    """A stream for the runs endpoint."""
+    """A stream for the runs endpoint.
+
+    With ``runs_status``, only runs with these statuses are listed. Runs listed while
+    still in progress are kept in the state of their partition and fetched again by
+    ID on the next sync, so their final status is emitted even if they finished
+    before the new bookmark.
+    """
 
     name = "runs"
     path = "/accounts/{account_id}/runs"
     openapi_ref = "Run"
     replication_key = "finished_at"
     is_sorted = True
+    required_properties = ("artifacts_saved", "job_definition_id")
+
+    _pipeline: Iterator[tuple[Context, Iterator[Record]]] | None = None
+
+    @property
+    @override
+    def partitions(self) -> list[dict[str, Any]]:
+        """Return the accounts, or the jobs of each account with job partitioning."""
+        if self.config.get("runs_partition_by_job"):
+            return self._job_partitions
+        return super().partitions
+
+    @cached_property
+    def _job_partitions(self) -> list[dict[str, Any]]:
+        partitions: list[dict[str, Any]] = []
+        for account in super().partitions:
+            account_id = account["account_id"]
+            try:
+                job_ids = self.job_index.get_ids(account_id)
+            except (AccountCircuitOpenError, *API_ERRORS) as e:
+                if self.circuit_breaker.threshold <= 0:
+                    raise
+                self.logger.exception(
+                    "Failed to list the jobs of account %s, skipping its runs",
+                    account_id,
+                )
+                self.add_failed_account(account_id, str(e))
+                continue
+            partitions.extend(
+                {"account_id": account_id, "job_definition_id": job_id}
+                for job_id in job_ids
+            )
+        return partitions
+
+    def _seed_job_bookmarks(self, partitions: list[dict[str, Any]]) -> None:
+        """Start new job partitions from the bookmark of their account, if any.
+
+        The starting value of every partition is also written to the state before
+        partitions are requested from other threads, ahead of the SDK.
+        """
+        account_bookmarks = {
+            partition["context"]["account_id"]: partition
+            for partition in self.stream_state.get("partitions", [])
+            if set(partition["context"]) == {"account_id"}
+            and partition.get("replication_key_value")
+        }
+        for partition in partitions:
+            state = self.get_context_state(partition)
+            account_state = account_bookmarks.get(partition["account_id"])
+            if account_state is not None and not state.get("replication_key_value"):
+                state["replication_key"] = account_state["replication_key"]
+                state["replication_key_value"] = account_state["replication_key_value"]
+            self._write_starting_replication_value(partition)
+
+    @override
+    def _sync_records(
+        self,
+        context: Context | None = None,
+        *,
+        write_messages: bool = True,
+    ) -> Generator[Record, Any, Any]:
+        if context is not None or not self.config.get("runs_partition_by_job"):
+            yield from super()._sync_records(context, write_messages=write_messages)
+            return
+
+        # Job partitions are requested concurrently, a page ahead at most, while the
+        # SDK processes them one by one
+        partitions = self.partitions
+        self._seed_job_bookmarks(partitions)
+        pipeline = ordered_chain(
+            self._request_partition,
+            partitions,
+            self.config["max_concurrent_requests"],
+            self.config["page_size"],
+        )
+        self._pipeline = pipeline
+        try:
+            yield from super()._sync_records(None, write_messages=write_messages)
+        finally:
+            pipeline.close()
+            self._pipeline = None
+
+    def _request_partition(self, partition: Context) -> Iterable[Record]:
+        # Job partitions are already requested ahead, in their own threads
+        return self._request_records(partition)
+
+    @override
+    def request_records(self, context: Context | None) -> Iterable[Record]:
+        if self._pipeline is not None and context is not None:
+            # Partitions skipped by the circuit breaker are passed over
+            for partition, records in self._pipeline:
+                if partition == context:
+                    yield from records
+                    return
+        yield from super().request_records(context)
+
+    def _fetch_run(self, context: Context, run_id: int) -> Record | None:
+        response = self.send_request(
+            "GET",
+            f"{self.get_url(context)}/{run_id}/",
+            context=context,
+        )
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return None
+
+        run: Record = response_json(response)["data"]
+        keep = self.get_pruned_properties()
+        if keep is None:
+            return run
+        return {key: value for key, value in run.items() if key in keep}
+
+    def _recheck_in_flight(self, context: Context) -> tuple[list[Record], list[int]]:
+        """Fetch the runs which were in progress at the last sync again.
+
+        Returns:
+            The runs which finished before the bookmark, and are no longer listed,
+            in ``finished_at`` order, and the IDs of the runs still in progress.
+        """
+        run_ids: list[int] = self.get_context_state(context).get(
+            "in_flight_run_ids",
+            [],
+        )
+        start = self.get_starting_timestamp(context)
+        statuses = self.config.get("runs_status")
+        missed: list[Record] = []
+        in_flight: list[int] = []
+
+        for run_id, run in zip(
+            run_ids,
+            ordered_map(
+                lambda run_id: self._fetch_run(context, run_id),
+                run_ids,
+                self.config["max_concurrent_requests"],
+            ),
+            strict=True,
+        ):
+            if run is None:
+                self.logger.info("Run %s in progress at the last sync is gone", run_id)
+            elif run.get("status") in IN_PROGRESS_RUN_STATUSES:
+                in_flight.append(run_id)
+            elif (
+                start is not None
+                and (
+                    run.get("finished_at") is None
+                    or datetime.datetime.fromisoformat(run["finished_at"]) < start
+                )
+                and (not statuses or run.get("status") in statuses)
+            ):
+                missed.append(run)
+
+        missed.sort(key=lambda run: run.get("finished_at") or "")
+        return missed, in_flight
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[Record]:
+        assert context is not None  # noqa: S101
+
+        missed, in_flight = self._recheck_in_flight(context)
+        if missed:
+            self.logger.info(
+                "Emitting %d runs which finished before the bookmark of %s",
+                len(missed),
+                context,
+            )
+        for run in missed:
+            record = self.post_process(run, context)
+            if record is not None:
+                self._rechecked_run_ids.add(record["id"])
+                yield record
+
+        for record in self._list_new_runs(context):
+            if record.get("status") in IN_PROGRESS_RUN_STATUSES:
+                in_flight.append(record["id"])
+            yield record
+
+        # Only replace the in-flight runs once the whole partition was listed
+        state = self.get_context_state(context)
+        if in_flight or state.get("in_flight_run_ids"):
+            state["in_flight_run_ids"] = sorted(set(in_flight))
+            self.state_manager.is_flushed = False
+
+    def _list_new_runs(self, context: Context) -> Iterator[Record]:
+        """List the runs of a partition, from its bookmark.
+
+        The listing starts at the bookmark, so the runs which finished at the
+        bookmark are listed again by every sync of the partition. The ones already
+        emitted by this process are skipped.
+        """
+        key = partition_key(context)
+        last_finished_at, last_run_ids = self._last_emitted.get(key, (None, set()))
+        for record in super().get_records(context):
+            finished_at = record.get("finished_at")
+            if finished_at is not None and finished_at == last_finished_at:
+                if record["id"] in last_run_ids:
+                    continue
+                last_run_ids.add(record["id"])
+            elif finished_at is not None:
+                last_finished_at, last_run_ids = finished_at, {record["id"]}
+            yield record
+        if last_finished_at is not None:
+            self._last_emitted[key] = (last_finished_at, last_run_ids)
+
+    @cached_property
+    def _rechecked_run_ids(self) -> set[int]:
+        return set()
+
+    @cached_property
+    def _last_emitted(self) -> dict[str, tuple[str, set[int]]]:
+        """Last ``finished_at`` emitted, and the runs finished then, by partition."""
+        return {}
+
+    @override
+    def _increment_stream_state(
+        self,
+        latest_record: Record,
+        *,
+        context: Context | None = None,
+    ) -> None:
+        # Runs fetched again by ID finished before the bookmark, which stays put
+        if latest_record.get("id") in self._rechecked_run_ids:
+            return
+        super()._increment_stream_state(latest_record, context=context)
+
+    @override
+    def validate_response(self, response: requests.Response) -> None:
+        # A run in progress at the last sync may have been deleted since
+        if response.status_code == HTTPStatus.NOT_FOUND and (
+            urllib.parse.urlsplit(str(response.request.url))
+            .path.rstrip("/")
+            .rsplit("/", 1)[-1]
+            .isdigit()
+        ):
+            return
+        super().validate_response(response)
 
     @override
     def get_child_context(self, record: Record, context: Context | None) -> Context:
@@ -212,9 +912,33 @@ class RunsStream(AccountBasedIncrementalStream):
         return {
             **context,
             "run_id": record["id"],
+            "job_definition_id": record.get("job_definition_id"),
+            "finished_at": record.get("finished_at"),
             "artifacts_saved": record["artifacts_saved"],
         }
 
+    @override
+    def prefetch_next(
+        self,
+        response: requests.Response,
+        context: Context | None,
+    ) -> None:
+        """Also prefetch the child requests of every run in the page."""
+        super().prefetch_next(response, context)
+
+        children = [
+            child
+            for child in self.child_streams
+            if child.selected and isinstance(child, DBTStream)
+        ]
+        if not children:
+            return
+
+        for record in response_json(response).get("data") or []:
+            child_context = self.get_child_context(record, context)
+            for child in children:
+                child.prefetch(child_context)
+
     @override
     def get_url_params(
         self,
@@ -223,6 +947,14 @@ class RunsStream(AccountBasedIncrementalStream):
     ) -> dict[str, Any]:
         params = super().get_url_params(context, next_page_token)
         params["order_by"] = "finished_at"
+        if context and "job_definition_id" in context:
+            params["job_definition_id"] = context["job_definition_id"]
+
+        statuses = self.config.get("runs_status")
+        if statuses and len(statuses) == 1:
+            params["status"] = statuses[0]
+        elif statuses:
+            params["status__in"] = json.dumps(sorted(statuses))
 
         start = self.get_starting_timestamp(context)
 
@@ -237,7 +969,7 @@ class RunsStream(AccountBasedIncrementalStream):
         return params
 
 
-class UsersStream(_AccountBasedStream):
+class UsersStream(_ChangeDetectingStream):
     """A stream for the users endpoint."""
 
     name = "users"
@@ -246,7 +978,7 @@ class UsersStream(_AccountBasedStream):
     selected_by_default = False
 
 
-class GroupsStream(_AccountBasedStream):
+class GroupsStream(_ChangeDetectingStream):
     """A stream for the groups endpoint."""
 
     name = "groups"
@@ -256,12 +988,200 @@ class GroupsStream(_AccountBasedStream):
 
 
 class AuditLogsStream(_AccountBasedStream):
-    """A stream for the audit-logs endpoint."""
+    """A stream for the audit-logs endpoint.
+
+    Audit logs are synced incrementally by ``created_at``. Starting from the account
+    bookmark (or ``start_date``), the date range up to now is split into windows of
+    ``audit_logs_window_days`` days that are requested concurrently and emitted in
+    chronological order.
+
+    With ``audit_logs_bulk_export``, accounts without a bookmark are first loaded from
+    a bulk CSV export, and paging resumes from the latest exported event.
+    """
 
     name = "audit_logs"
     path = "/accounts/{account_id}/audit-logs"
     openapi_ref = "PublicAuditLogResponse"
     api_version = "v3"
+    replication_key = "created_at"
+    is_sorted = False
+
+    #: Seconds to wait before the first export status check
+    export_poll_interval = 1.0
+    #: Maximum seconds between export status checks
+    export_poll_max_interval = 60.0
+    #: Seconds to wait for an export to finish before giving up
+    export_timeout = 3600.0
+
+    def _get_windows(
+        self,
+        context: Context | None,
+        start: datetime.datetime | None = None,
+    ) -> list[tuple[datetime.datetime | None, datetime.datetime | None]]:
+        start = start or self.get_starting_timestamp(context)
+        if start is None:
+            return [(None, None)]
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        step = datetime.timedelta(days=self.config["audit_logs_window_days"])
+        windows: list[tuple[datetime.datetime | None, datetime.datetime | None]] = []
+        while start + step < now:
+            windows.append((start, start + step))
+            start += step
+
+        # The last window is left open, so events logged during the sync are not lost
+        windows.append((start, None))
+        return windows
+
+    def _request_window(
+        self,
+        context: Context,
+        window: tuple[datetime.datetime | None, datetime.datetime | None],
+    ) -> Iterator[Record]:
+        start, end = window
+        window_context = {
+            **context,
+            "logged_at_start": start.isoformat() if start else None,
+            "logged_at_end": end.isoformat() if end else None,
+        }
+        return (
+            record
+            for record in self.request_records(window_context)
+            # Window bounds may overlap, so each event is only kept in one window
+            if end is None
+            or datetime.datetime.fromisoformat(record["created_at"]) < end
+        )
+
+    def _run_export(self, context: Context) -> requests.Response | None:
+        export_url = f"{self.get_url(context)}/export/"
+
+        response = self.send_request("POST", export_url, context=context)
+        if response.status_code == HTTPStatus.BAD_REQUEST:
+            return None
+        job_id = response.json()["data"]["job_id"]
+        self.logger.info(
+            "Started audit log export %s for account %s",
+            job_id,
+            context["account_id"],
+        )
+
+        interval = self.export_poll_interval
+        deadline = time.monotonic() + self.export_timeout
+        while True:
+            status = self.send_request("GET", export_url, context=context).json()
+            if not status["data"]["is_running"]:
+                break
+            if time.monotonic() > deadline:
+                errmsg = f"Audit log export {job_id} did not finish in time"
+                raise RuntimeError(errmsg)
+            with blocking():
+                time.sleep(interval)
+            interval = min(interval * 2, self.export_poll_max_interval)
+
+        download = self.send_request(
+            "GET",
+            f"{export_url}{job_id}/download/",
+            context=context,
+        )
+        download_url = download.json()["data"]["download_url"]
+
+        # Download URLs are usually pre-signed links to another host, which must not
+        # receive the dbt Cloud API token
+        same_host = (
+            urllib.parse.urlsplit(download_url).netloc
+            == urllib.parse.urlsplit(self.url_base).netloc
+        )
+        return self.send_request(
+            "GET",
+            download_url,
+            context=context,
+            authenticate=same_host,
+            stream=True,
+        )
+
+    @staticmethod
+    def _parse_export_row(row: dict[str, str]) -> Record:
+        record: Record = {}
+        for key, value in row.items():
+            if value == "":
+                record[key] = None
+            elif key == "account_id":
+                record[key] = int(value)
+            elif key in {"actor", "event_context"} and value[0] in "[{":
+                record[key] = json.loads(value)
+            else:
+                record[key] = value
+        return record
+
+    def _export_records(self, context: Context) -> Iterator[Record]:
+        """Yield the events of a bulk export, decoding the CSV as it is downloaded."""
+        response = self._run_export(context)
+        if response is None:
+            return
+
+        start = self.get_starting_timestamp(context)
+        with response:
+            response.raw.decode_content = True
+            # Keep the stream readable until TextIOWrapper sees the end of it
+            response.raw.auto_close = False
+            text = io.TextIOWrapper(
+                cast("IO[bytes]", response.raw),
+                encoding="utf-8",
+                newline="",
+            )
+            for row in csv.DictReader(text):
+                record = self._parse_export_row(row)
+                if (
+                    start is None
+                    or datetime.datetime.fromisoformat(record["created_at"]) >= start
+                ):
+                    yield record
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[Record]:
+        assert context is not None  # noqa: S101
+
+        exported_until: datetime.datetime | None = None
+        if (
+            self.config.get("audit_logs_bulk_export")
+            and self.get_starting_replication_key_value(context) is None
+        ):
+            for record in self._export_records(context):
+                created_at = datetime.datetime.fromisoformat(record["created_at"])
+                if exported_until is None or created_at > exported_until:
+                    exported_until = created_at
+                yield record
+
+        windows = self._get_windows(context, exported_until)
+        if len(windows) == 1:
+            yield from self._request_window(context, windows[0])
+            return
+
+        self.logger.info(
+            "Requesting %d audit log windows for account %s",
+            len(windows),
+            context["account_id"],
+        )
+        for records in ordered_map(
+            lambda window: list(self._request_window(context, window)),
+            windows,
+            self.config["max_concurrent_requests"],
+        ):
+            yield from records
+
+    @override
+    def get_url_params(
+        self,
+        context: Context | None,
+        next_page_token: int | None,
+    ) -> dict[str, Any]:
+        params = super().get_url_params(context, next_page_token)
+        if context:
+            if start := context.get("logged_at_start"):
+                params["logged_at_start"] = start
+            if end := context.get("logged_at_end"):
+                params["logged_at_end"] = end
+        return params
 
     @override
     def validate_response(self, response: requests.Response) -> None:
@@ -280,7 +1200,13 @@ class AuditLogsStream(_AccountBasedStream):
 
 
 class RunArtifacts(_AccountBasedStream):
-    """A stream for the run_artifacts endpoint."""
+    """A stream for the run_artifacts endpoint.
+
+    Runs are listed at most once. Runs are synced in ``finished_at`` order, so the
+    state of each account only keeps the ``finished_at`` of the last listed run and
+    the IDs of the runs listed with that same timestamp. Runs emitted again by the
+    parent, because their window overlaps the last sync, are skipped.
+    """
 
     name = "run_artifacts"
     path = "/accounts/{account_id}/runs/{run_id}/artifacts"
@@ -294,15 +1220,61 @@ class RunArtifacts(_AccountBasedStream):
     primary_keys = ("account_id", "run_id", "path")  # type: ignore[assignment]
 
     parent_stream_type = RunsStream
-    state_partitioning_keys = ()
+    state_partitioning_keys = ("account_id",)
+
+    def _is_listed(self, context: Context) -> bool:
+        """Whether the artifacts of a run were already listed."""
+        finished_at = context.get("finished_at")
+        state = self.get_context_state(context)
+        last_finished_at = state.get("last_finished_at")
+        if finished_at is None or last_finished_at is None:
+            return False
+
+        finished = datetime.datetime.fromisoformat(finished_at)
+        last_finished = datetime.datetime.fromisoformat(last_finished_at)
+        return finished < last_finished or (
+            finished == last_finished and context["run_id"] in state["run_ids"]
+        )
+
+    def _mark_listed(self, context: Context) -> None:
+        finished_at = context.get("finished_at")
+        if finished_at is None:
+            return
+
+        state = self.get_context_state(context)
+        last_finished_at = state.get("last_finished_at")
+        if last_finished_at is None or datetime.datetime.fromisoformat(
+            finished_at,
+        ) > datetime.datetime.fromisoformat(last_finished_at):
+            state["last_finished_at"] = finished_at
+            state["run_ids"] = [context["run_id"]]
+        else:
+            state["run_ids"].append(context["run_id"])
+        self.state_manager.is_flushed = False
 
     @override
     def get_records(self, context: Context | None) -> Iterable[Record]:
         assert context is not None  # noqa: S101
 
+        if self._is_listed(context):
+            self.logger.debug(
+                "Skipping run %s, its artifacts were already listed",
+                context["run_id"],
+            )
+            return
+
         if context["artifacts_saved"]:
-            return super().get_records(context)
-        return []
+            yield from super().get_records(context)
+
+        # Only remember the run once all of its artifacts were emitted
+        self._mark_listed(context)
+
+    @override
+    def prefetch(self, context: Context | None, offset: int | None = None) -> None:
+        assert context is not None  # noqa: S101
+
+        if context["artifacts_saved"] and not self._is_listed(context):
+            super().prefetch(context, offset)
 
     @override
     def parse_response(self, response: requests.Response) -> Iterable[Record]:
@@ -323,3 +1295,215 @@ class RunArtifacts(_AccountBasedStream):
         row["account_id"] = context["account_id"]
         row["run_id"] = context["run_id"]
         return row
+
+
+class _RunArtifactFileStream(_AccountBasedStream):
+    """A child stream of runs parsing one artifact file of each run.
+
+    Artifact files can be very large, so they are parsed as they are downloaded and
+    never prefetched. Runs without saved artifacts or without this artifact are
+    skipped.
+
+    State is kept per job: the last run of each job whose artifact was processed is
+    bookmarked, and runs of the job that finished before it are skipped, so syncing
+    an overlapping window of runs again downloads no artifacts.
+    """
+
+    artifact_path: str
+    path = "/accounts/{account_id}/runs/{run_id}/artifacts/{artifact_path}"
+    openapi_ref = None  # type: ignore[assignment]
+    parent_stream_type = RunsStream
+    state_partitioning_keys = ("account_id", "job_definition_id")
+    selected_by_default = False
+
+    def parse_artifact(self, fileobj: IO[bytes], context: Context) -> Iterator[Record]:
+        """Parse the records of an artifact file.
+
+        Args:
+            fileobj: The artifact file, read as it is downloaded.
+            context: The run context.
+        """
+        raise NotImplementedError
+
+    @property
+    @override
+    def partitions(self) -> list[dict[str, Any]] | None:  # type: ignore[override]
+        # Contexts come from the runs stream, and state partitions are created per
+        # job as runs are processed
+        return None
+
+    @staticmethod
+    def _run_position(
+        finished_at: str | None,
+        run_id: int | None,
+    ) -> tuple[datetime.datetime, int] | None:
+        if finished_at is None or run_id is None:
+            return None
+        return datetime.datetime.fromisoformat(finished_at), run_id
+
+    def _is_processed(self, context: Context) -> bool:
+        """Whether the run finished before the last processed run of its job."""
+        state = self.get_context_state(context)
+        run = self._run_position(context.get("finished_at"), context["run_id"])
+        last = self._run_position(
+            state.get("last_run_finished_at"),
+            state.get("last_run_id"),
+        )
+        return run is not None and last is not None and run <= last
+
+    def _mark_processed(self, context: Context) -> None:
+        if context.get("finished_at") is None:
+            return
+        state = self.get_context_state(context)
+        state["last_run_finished_at"] = context["finished_at"]
+        state["last_run_id"] = context["run_id"]
+        self.state_manager.is_flushed = False
+
+    def _download_records(self, context: Context) -> Iterator[Record]:
+        url = self.get_url({**context, "artifact_path": self.artifact_path})
+        with self.send_request("GET", url, context=context, stream=True) as response:
+            if response.status_code == HTTPStatus.NOT_FOUND:
+                self.logger.info(
+                    "Run %s has no %s",
+                    context["run_id"],
+                    self.artifact_path,
+                )
+                return
+
+            response.raw.decode_content = True
+            for record in self.parse_artifact(
+                cast("IO[bytes]", response.raw),
+                context,
+            ):
+                yield {
+                    "account_id": context["account_id"],
+                    "run_id": context["run_id"],
+                    "job_definition_id": context.get("job_definition_id"),
+                    **record,
+                }
+
+    @override
+    def get_records(self, context: Context | None) -> Iterable[Record]:
+        assert context is not None  # noqa: S101
+
+        if self._is_processed(context):
+            self.logger.debug(
+                "Skipping run %s, its %s was already processed",
+                context["run_id"],
+                self.artifact_path,
+            )
+            return
+
+        if context["artifacts_saved"]:
+            yield from self._download_records(context)
+
+        # Only bookmark the run once all of its records were emitted
+        self._mark_processed(context)
+
+    @override
+    def prefetch(self, context: Context | None, offset: int | None = None) -> None:
+        pass
+
+    @override
+    def validate_response(self, response: requests.Response) -> None:
+        if response.status_code == HTTPStatus.NOT_FOUND:
+            return
+        super().validate_response(response)
+
+
+MANIFEST_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+class ManifestNodesStream(_RunArtifactFileStream):
+    """Nodes, sources and exposures of the ``manifest.json`` of each run.
+
+    With ``skip_unchanged_manifests``, a checksum of the last manifest of each job is
+    kept in the job state. When a run's manifest has the same checksum, its nodes are
+    not emitted again: a single ``manifest`` record points to the earlier run with
+    ``same_as_run_id`` instead.
+    """
+
+    name = "manifest_nodes"
+    artifact_path = "manifest.json"
+    schema = th.PropertiesList(
+        th.Property("account_id", th.StringType),
+        th.Property("run_id", th.IntegerType),
+        th.Property("job_definition_id", th.IntegerType),
+        th.Property("unique_id", th.StringType),
+        th.Property("resource_type", th.StringType),
+        th.Property("package_name", th.StringType),
+        th.Property("name", th.StringType),
+        th.Property("original_file_path", th.StringType),
+        th.Property("checksum", th.StringType),
+        th.Property("depends_on", th.ArrayType(th.StringType)),
+        th.Property("config", th.ObjectType(additional_properties=True)),
+        th.Property("same_as_run_id", th.IntegerType),
+    ).to_dict()
+    primary_keys = ("account_id", "run_id", "unique_id")  # type: ignore[assignment]
+
+    @override
+    def parse_artifact(self, fileobj: IO[bytes], context: Context) -> Iterator[Record]:
+        if not self.config.get("skip_unchanged_manifests"):
+            yield from iter_manifest_nodes(fileobj)
+            return
+
+        # The manifest is read twice, first to hash it and then to parse it, so it is
+        # buffered, spilling to disk once it gets large
+        with tempfile.SpooledTemporaryFile(MANIFEST_BUFFER_SIZE) as buffer:
+            shutil.copyfileobj(fileobj, buffer)
+            buffer.seek(0)
+            checksum = manifest_checksum(buffer)
+
+            state = self.get_context_state(context)
+            if state.get("manifest_checksum") == checksum:
+                self.logger.info(
+                    "Manifest of run %s is unchanged since run %s",
+                    context["run_id"],
+                    state["manifest_run_id"],
+                )
+                yield {
+                    "unique_id": "manifest",
+                    "resource_type": "manifest",
+                    "checksum": checksum,
+                    "same_as_run_id": state["manifest_run_id"],
+                }
+                return
+
+            buffer.seek(0)
+            yield from iter_manifest_nodes(buffer)
+
+        state["manifest_checksum"] = checksum
+        state["manifest_run_id"] = context["run_id"]
+        self.state_manager.is_flushed = False
+
+
+class RunResultsStream(_RunArtifactFileStream):
+    """Status and timing of each node of the ``run_results.json`` of each run."""
+
+    name = "run_results"
+    artifact_path = "run_results.json"
+    schema = th.PropertiesList(
+        th.Property("account_id", th.StringType),
+        th.Property("run_id", th.IntegerType),
+        th.Property("job_definition_id", th.IntegerType),
+        th.Property("unique_id", th.StringType),
+        th.Property("status", th.StringType),
+        th.Property("execution_time", th.NumberType),
+        th.Property("thread_id", th.StringType),
+        th.Property("failures", th.IntegerType),
+        th.Property(
+            "timing",
+            th.ArrayType(
+                th.ObjectType(
+                    th.Property("name", th.StringType),
+                    th.Property("started_at", th.DateTimeType),
+                    th.Property("completed_at", th.DateTimeType),
+                ),
+            ),
+        ),
+    ).to_dict()
+    primary_keys = ("account_id", "run_id", "unique_id")  # type: ignore[assignment]
+
+    @override
+    def parse_artifact(self, fileobj: IO[bytes], context: Context) -> Iterator[Record]:
+        return iter_run_results(fileobj)
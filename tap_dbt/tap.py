@@ -2,40 +2,70 @@
 
 from __future__ import annotations
 
+import functools
+import weakref
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, cast
+
 from singer_sdk import Stream, Tap
+from singer_sdk.io_base import SingerWriter
 from singer_sdk.typing import (
     ArrayType,
+    BooleanType,
+    DateTimeType,
     IntegerType,
+    ObjectType,
     PropertiesList,
     Property,
     StringType,
 )
 
+from tap_dbt.aio import AsyncHTTPEngine, create_engine
+from tap_dbt.circuit import CircuitBreaker
+from tap_dbt.concurrency import StreamScheduler
+from tap_dbt.follow import RunsFollower
+from tap_dbt.index import AccountIndex
+from tap_dbt.progress import ProgressReporter
+from tap_dbt.replay import HTTPArchive, create_archive
+from tap_dbt.response_cache import ResponseCache, get_response_cache
+from tap_dbt.sharding import filter_state
 from tap_dbt.streams import (
     AccountsStream,
     AuditLogsStream,
     ConnectionsStream,
+    CredentialsStream,
     EnvironmentsStream,
+    EnvironmentVariablesStream,
     GroupsStream,
     JobsStream,
+    ManifestNodesStream,
     ProjectsStream,
     RepositoriesStream,
     RunArtifacts,
+    RunResultsStream,
     RunsStream,
     UsersStream,
 )
+from tap_dbt.writer import BufferedSingerWriter
+
+if TYPE_CHECKING:
+    from singer_sdk.singerlib.encoding.base import GenericSingerWriter
 
 TAP_NAME = "tap-dbt"
 STREAM_TYPES = [
     AccountsStream,
     AuditLogsStream,
     ConnectionsStream,
+    CredentialsStream,
     EnvironmentsStream,
+    EnvironmentVariablesStream,
     GroupsStream,
     JobsStream,
+    ManifestNodesStream,
     ProjectsStream,
     RepositoriesStream,
     RunArtifacts,
+    RunResultsStream,
     RunsStream,
     UsersStream,
 ]
@@ -72,11 +102,450 @@ class TapDBT(Tap):
             description="Page size to use in limit= url parameter",
             required=True,
         ),
+        Property(
+            "start_date",
+            DateTimeType,
+            description=(
+                "Earliest record to sync for the incremental `runs` and `audit_logs` "
+                "streams when there is no bookmark"
+            ),
+        ),
+        Property(
+            "audit_logs_window_days",
+            IntegerType,
+            default=30,
+            description=(
+                "Size in days of the date ranges audit logs are requested in. "
+                "Windows are requested concurrently"
+            ),
+        ),
+        Property(
+            "audit_logs_bulk_export",
+            BooleanType,
+            default=False,
+            description=(
+                "Load the audit history of accounts without a bookmark from a bulk "
+                "CSV export before paging new events"
+            ),
+        ),
+        Property(
+            "shard_index",
+            IntegerType,
+            default=0,
+            description=(
+                "Zero-based index of this tap process when the configured accounts "
+                "are split across several processes"
+            ),
+        ),
+        Property(
+            "shard_count",
+            IntegerType,
+            default=1,
+            description="Total number of tap processes sharing the configured accounts",
+        ),
+        Property(
+            "skip_unchanged_records",
+            BooleanType,
+            default=False,
+            description=(
+                "Only emit connections, environments, groups, repositories and users "
+                "records whose content changed since the last sync"
+            ),
+        ),
+        Property(
+            "fingerprint_store_path",
+            StringType,
+            description=(
+                "Local JSON file to keep record fingerprints in. If not set, they are "
+                "kept in the tap state"
+            ),
+        ),
+        Property(
+            "emit_tombstones",
+            BooleanType,
+            default=False,
+            description=(
+                "When skipping unchanged records, emit records that disappeared since "
+                "the last sync with `_sdc_deleted_at` set"
+            ),
+        ),
+        Property(
+            "runs_partition_by_job",
+            BooleanType,
+            default=False,
+            description=(
+                "Partition runs by job instead of by account, with one bookmark per "
+                "job. Job partitions are requested concurrently, up to "
+                "`max_concurrent_requests` at once"
+            ),
+        ),
+        Property(
+            "runs_status",
+            ArrayType(IntegerType),
+            description=(
+                "Only sync runs with these statuses, filtered by the API: 1 (queued), "
+                "2 (starting), 3 (running), 10 (success), 20 (error) or 30 "
+                "(cancelled). Runs listed while in progress are fetched again on the "
+                "next sync"
+            ),
+        ),
+        Property(
+            "follow",
+            BooleanType,
+            default=False,
+            description=(
+                "Keep running after the sync, polling the `runs` stream from its "
+                "bookmarks and emitting runs as they finish, until the process is "
+                "stopped or `follow_duration` elapses"
+            ),
+        ),
+        Property(
+            "follow_min_interval",
+            IntegerType,
+            default=5,
+            description="Seconds between polls of accounts with runs finishing",
+        ),
+        Property(
+            "follow_max_interval",
+            IntegerType,
+            default=300,
+            description=(
+                "Maximum seconds between polls of idle accounts, the interval "
+                "doubling with every poll without new runs"
+            ),
+        ),
+        Property(
+            "follow_duration",
+            IntegerType,
+            default=0,
+            description=(
+                "Seconds after which to stop following. Set to 0 to follow until the "
+                "process is stopped"
+            ),
+        ),
+        Property(
+            "skip_unchanged_manifests",
+            BooleanType,
+            default=False,
+            description=(
+                "Only emit the manifest_nodes records of a run if its manifest changed "
+                "since the last run of the same job, and a single reference to that "
+                "run otherwise"
+            ),
+        ),
+        Property(
+            "async_http",
+            BooleanType,
+            default=False,
+            description=(
+                "Send requests from an asyncio event loop, prefetching upcoming pages, "
+                "partitions and run artifacts. Requires the `async` extra"
+            ),
+        ),
+        Property(
+            "pipelined_pagination",
+            BooleanType,
+            default=False,
+            description=(
+                "Request the next page of a stream in a background thread while the "
+                "records of the current page are processed"
+            ),
+        ),
+        Property(
+            "http_archive_mode",
+            StringType,
+            default="off",
+            allowed_values=["off", "record", "replay"],
+            description=(
+                "`record` writes every request and response to `http_archive_path`, "
+                "with credentials redacted. `replay` serves responses from that "
+                "archive without any network access"
+            ),
+        ),
+        Property(
+            "http_archive_path",
+            StringType,
+            description="Zip file of the HTTP archive",
+        ),
+        Property(
+            "http_archive_latency",
+            BooleanType,
+            default=False,
+            description=(
+                "When replaying, wait as long as each request originally took"
+            ),
+        ),
+        Property(
+            "max_concurrent_requests",
+            IntegerType,
+            default=8,
+            description=(
+                "Maximum number of concurrent requests, including the requests of "
+                "project-scoped streams to the projects of an account"
+            ),
+        ),
+        Property(
+            "concurrent_streams",
+            IntegerType,
+            default=1,
+            description=(
+                "Maximum number of top-level streams synced at once. Streams then "
+                "share `max_concurrent_requests` requests in flight"
+            ),
+        ),
+        Property(
+            "circuit_breaker_threshold",
+            IntegerType,
+            default=5,
+            description=(
+                "Skip the remaining partitions of an account for the rest of the sync "
+                "after this many consecutive failed requests, retries included. Set "
+                "to 0 to fail the whole sync on the first failing account instead"
+            ),
+        ),
+        Property(
+            "progress_interval",
+            IntegerType,
+            default=60,
+            description=(
+                "Seconds between progress reports of a partition, with the records "
+                "fetched out of the total announced by the API, throughput and ETA. "
+                "Set to 0 to disable progress reports"
+            ),
+        ),
+        Property(
+            "schema_cache",
+            BooleanType,
+            default=True,
+            description=(
+                "Cache the stream schemas generated from the bundled OpenAPI specs on "
+                "disk, keyed by the tap version and a hash of the specs"
+            ),
+        ),
+        Property(
+            "schema_cache_dir",
+            StringType,
+            description=(
+                "Directory of the schema cache. Defaults to `tap-dbt` in "
+                "`$XDG_CACHE_HOME` or `~/.cache`"
+            ),
+        ),
+        Property(
+            "response_cache",
+            BooleanType,
+            default=False,
+            description=(
+                "Cache the responses of the accounts, projects, environments, "
+                "connections, repositories, groups and users endpoints on disk, so "
+                "syncs within their TTL send no requests to these endpoints"
+            ),
+        ),
+        Property(
+            "response_cache_dir",
+            StringType,
+            description=(
+                "Directory of the response cache. Defaults to `tap-dbt/responses` in "
+                "`$XDG_CACHE_HOME` or `~/.cache`"
+            ),
+        ),
+        Property(
+            "response_cache_ttls",
+            ObjectType(additional_properties=IntegerType),
+            description=(
+                "Seconds the responses of each stream are cached for, by stream name. "
+                "Streams default to 3600 seconds, and 0 disables the cache of a stream"
+            ),
+        ),
+        Property(
+            "response_cache_max_bytes",
+            IntegerType,
+            default=64 * 1024 * 1024,
+            description=(
+                "Size of the cached responses above which the oldest ones are removed"
+            ),
+        ),
+        Property(
+            "buffered_output",
+            BooleanType,
+            default=False,
+            description=(
+                "Encode RECORD messages with a faster encoder and write messages to "
+                "stdout in large chunks, flushed with every STATE message. The output "
+                "is identical"
+            ),
+        ),
+        Property(
+            "batch_file_max_bytes",
+            IntegerType,
+            description=(
+                "Start a new batch file once the records written to the current one "
+                "reach this many bytes, before compression. Batch files are also "
+                "rotated every `batch_config.batch_size` records"
+            ),
+        ),
     ).to_dict()
 
+    @property
+    def message_writer_class(self) -> type[GenericSingerWriter[Any, Any]]:  # type: ignore[override]
+        """Return the message writer class, buffered with `buffered_output`."""
+        if self.config.get("buffered_output"):
+            return BufferedSingerWriter
+        return SingerWriter
+
+    @cached_property
+    def http_engine(self) -> AsyncHTTPEngine | None:
+        """Return the async HTTP engine shared by all streams, if it is enabled.
+
+        The engine is closed once the tap is garbage collected, or at the latest when
+        the interpreter exits. Requests recorded to or replayed from an HTTP archive
+        go through the requests session instead.
+        """
+        if self.http_archive is not None:
+            if self.config.get("async_http"):
+                self.logger.warning(
+                    "Ignoring `async_http`, requests go through the HTTP archive",
+                )
+            return None
+
+        engine = create_engine(self.config)
+        if engine is not None:
+            self._close_http_engine = weakref.finalize(self, engine.close)
+        return engine
+
+    @cached_property
+    def http_archive(self) -> HTTPArchive | None:
+        """Return the HTTP archive shared by all streams, if one is configured.
+
+        The archive is closed once the tap is garbage collected, or at the latest when
+        the interpreter exits.
+        """
+        archive = create_archive(self.config)
+        if archive is not None:
+            self._close_http_archive = weakref.finalize(self, archive.close)
+        return archive
+
+    @cached_property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the response cache shared by all streams, if it is enabled.
+
+        Recording or replaying an HTTP archive disables the cache.
+        """
+        if self.http_archive is not None:
+            if self.config.get("response_cache"):
+                self.logger.warning(
+                    "Ignoring `response_cache`, requests go through the HTTP archive",
+                )
+            return None
+        return get_response_cache(self.config)
+
+    @cached_property
+    def project_index(self) -> AccountIndex:
+        """Return the projects of each account, shared by all streams."""
+        projects = cast("ProjectsStream", self.streams["projects"])
+        return AccountIndex(projects.fetch_projects)
+
+    @cached_property
+    def job_index(self) -> AccountIndex:
+        """Return the jobs of each account, shared by all streams."""
+        jobs = cast("JobsStream", self.streams["jobs"])
+        return AccountIndex(jobs.fetch_jobs)
+
+    @cached_property
+    def progress(self) -> ProgressReporter:
+        """Return the progress reporter shared by all streams."""
+        return ProgressReporter(self.config["progress_interval"])
+
+    @cached_property
+    def circuit_breaker(self) -> CircuitBreaker:
+        """Return the per-account circuit breaker shared by all streams."""
+        return CircuitBreaker(self.config["circuit_breaker_threshold"])
+
+    @cached_property
+    def scheduler(self) -> StreamScheduler:
+        """Return the scheduler of the streams synced concurrently."""
+        return StreamScheduler(
+            self.config["concurrent_streams"],
+            self.config["max_concurrent_requests"],
+        )
+
     def discover_streams(self) -> list[Stream]:
         """Return a list of discovered streams."""
         return [stream_class(tap=self) for stream_class in STREAM_TYPES]  # type: ignore[abstract]
 
+    def sync_all(self) -> None:  # type: ignore[misc]
+        """Sync all streams, then follow runs with `follow`.
+
+        Buffered messages are written out at the end.
+        """
+        try:
+            self._sync_all()
+            if self.config.get("follow"):
+                self._follow()
+        finally:
+            self._flush_messages()
+            # The archive is only readable once its zip index is written
+            if self.http_archive is not None and self.http_archive.recording:
+                self.http_archive.close()
+
+    def _sync_all(self) -> None:
+        """Sync all streams, up to `concurrent_streams` top-level streams at once.
+
+        Child streams are synced by their parent, so only top-level streams run
+        concurrently.
+        """
+        if self.config["concurrent_streams"] <= 1:
+            super().sync_all()
+            return
+
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        if self.state:
+            self._state_writer.write_state(self.state)
+
+        streams: list[Stream] = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+            elif stream.parent_stream_type is None:
+                streams.append(stream)
+            # Bookmarks are created up front, so no stream adds a key to the state
+            # while another one writes it
+            _ = stream.stream_state
+
+        # Shared helpers are created before threads race to create them
+        _ = self.http_engine, self.response_cache, self.circuit_breaker, self.progress
+        _ = self.project_index, self.job_index
+        self.scheduler.run(functools.partial(self._sync_stream, s) for s in streams)
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+        self._state_writer.write_state(self.state)
+
+    def _follow(self) -> None:
+        runs = cast("RunsStream", self.streams["runs"])
+        if not runs.selected:
+            self.logger.warning("Not following, the `runs` stream is not selected")
+            return
+
+        RunsFollower(
+            runs,
+            min_interval=self.config["follow_min_interval"],
+            max_interval=self.config["follow_max_interval"],
+            duration=self.config["follow_duration"],
+        ).run(after_poll=self._flush_messages)
+
+    def _flush_messages(self) -> None:
+        if isinstance(self.message_writer, BufferedSingerWriter):
+            self.message_writer.flush()
+
+    @staticmethod
+    def _sync_stream(stream: Stream) -> None:
+        stream.sync()
+        stream.finalize_state_progress_markers()
+
+    def load_state(self, state: dict[str, Any]) -> None:
+        """Load the state, keeping only the partitions owned by this shard."""
+        super().load_state(filter_state(self.config, state))
+
 
 cli = TapDBT.cli
@@ -5,8 +5,10 @@ from __future__ import annotations
 import sys
 from typing import TYPE_CHECKING
 
+import pytest
+
 if TYPE_CHECKING:
-    import pytest
+    from collections.abc import Iterator
 
 
 def pytest_configure(config: pytest.Config):
@@ -16,3 +18,11 @@ def pytest_configure(config: pytest.Config):
             "filterwarnings",
             "once:Python 3.10 will reach its end of life on 2026-10:FutureWarning",
         )
+
+
+@pytest.fixture(autouse=True, scope="session")
+def schema_cache_home(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Keep the schema cache of test taps out of the user's cache directory."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+        yield
@@ -0,0 +1,127 @@
+"""Tests for the async HTTP engine."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from requests import Response
+
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+pytest.importorskip("aiohttp")
+
+JOBS = {"1000": list(range(1, 6)), "2000": list(range(6, 9))}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests: list[str]
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        params = urllib.parse.parse_qs(url.query)
+        offset = int(params.get("offset", ["0"])[0])
+        limit = int(params.get("limit", ["100"])[0])
+        self.requests.append(self.path)
+
+        data: list[Any] = []
+        if match := re.fullmatch(r"/api/v2/accounts/(\d+)/jobs", url.path):
+            data = [{"id": job_id} for job_id in JOBS[match.group(1)]]
+        elif re.fullmatch(r"/api/v2/accounts/\d+/runs", url.path):
+            data = [
+                {
+                    "id": run_id,
+                    "artifacts_saved": run_id % 2 == 1,
+                    "finished_at": f"2024-01-0{run_id}T00:00:00+00:00",
+                }
+                for run_id in range(1, 4)
+            ]
+        elif url.path.endswith("/artifacts"):
+            data = ["manifest.json"]
+
+        body = {
+            "data": data if url.path.endswith("/artifacts") else data[offset:][:limit],
+            "extra": {"pagination": {"total_count": len(data)}},
+        }
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[tuple[str, list[str]]]:
+    """Serve a fake dbt Cloud API on localhost."""
+    handler = type("Handler", (_Handler,), {"requests": []})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/api/v2", handler.requests
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+
+def test_async_engine_sync(
+    server: tuple[str, list[str]],
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Prefetched responses are consumed in order and never requested twice."""
+    base_url, requests = server
+    decoded: list[Response] = []
+    response_json = Response.json
+
+    def json_once(response: Response, **kwargs: Any) -> Any:  # noqa: ANN401
+        decoded.append(response)
+        return response_json(response, **kwargs)
+
+    monkeypatch.setattr(Response, "json", json_once)
+    tap = TapDBT(
+        config={
+            "api_key": "abc123",
+            "account_ids": ["1000", "2000"],
+            "base_url": base_url,
+            "page_size": 2,
+            "async_http": True,
+            "max_concurrent_requests": 4,
+        },
+    )
+    tap.streams["run_artifacts"].selected = True
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m for m in messages if m["type"] == "RECORD"]
+
+    assert [r["record"]["id"] for r in records if r["stream"] == "jobs"] == [
+        *JOBS["1000"],
+        *JOBS["2000"],
+    ]
+    assert [
+        (r["record"]["account_id"], r["record"]["run_id"])
+        for r in records
+        if r["stream"] == "run_artifacts"
+    ] == [("1000", 1), ("1000", 3), ("2000", 1), ("2000", 3)]
+    assert len(requests) == len(set(requests))
+    # Prefetching the next pages and artifacts reuses the decoded page
+    assert len(decoded) == len({id(response) for response in decoded})
+
+    # The engine is left open until the tap is collected or the interpreter exits
+    engine = tap.http_engine
+    assert engine is not None
+    assert tap._close_http_engine.alive  # noqa: SLF001
+    tap._close_http_engine()  # noqa: SLF001
+    assert not engine._thread.is_alive()  # noqa: SLF001
@@ -0,0 +1,334 @@
+"""Tests for run artifact streams."""
+
+from __future__ import annotations
+
+import copy
+import io
+import json
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+import responses
+
+from tap_dbt.artifacts import iter_manifest_nodes, iter_run_results
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    import pytest
+
+API_URL = "https://cloud.getdbt.com/api/v2/accounts/1000"
+
+MANIFEST = {
+    "metadata": {"dbt_version": "1.8.0"},
+    "nodes": {
+        "model.shop.orders": {
+            "unique_id": "model.shop.orders",
+            "resource_type": "model",
+            "package_name": "shop",
+            "name": "orders",
+            "original_file_path": "models/orders.sql",
+            "raw_code": "select * from {{ source('raw', 'orders') }}",
+            "compiled_code": "select * from raw.orders",
+            "checksum": {"name": "sha256", "checksum": "abc"},
+            "depends_on": {
+                "macros": ["macro.dbt.x"],
+                "nodes": ["source.shop.raw.orders"],
+            },
+            "config": {"materialized": "table", "tags": ["daily"], "meta": {"a": 1}},
+            "columns": {"id": {"name": "id", "description": "Order ID"}},
+        },
+    },
+    "sources": {
+        "source.shop.raw.orders": {
+            "unique_id": "source.shop.raw.orders",
+            "resource_type": "source",
+            "config": {"enabled": True},
+        },
+    },
+    "macros": {"macro.dbt.x": {"unique_id": "macro.dbt.x"}},
+    "exposures": {
+        "exposure.shop.dashboard": {
+            "resource_type": "exposure",
+            "depends_on": {"nodes": ["model.shop.orders"]},
+        },
+    },
+    "parent_map": {"model.shop.orders": ["source.shop.raw.orders"]},
+}
+
+RUN_RESULTS = {
+    "metadata": {"dbt_version": "1.8.0"},
+    "results": [
+        {
+            "status": "success",
+            "timing": [
+                {
+                    "name": "compile",
+                    "started_at": "2024-01-01T00:00:00.000000Z",
+                    "completed_at": "2024-01-01T00:00:01.000000Z",
+                },
+                {
+                    "name": "execute",
+                    "started_at": "2024-01-01T00:00:01.000000Z",
+                    "completed_at": "2024-01-01T00:00:03.500000Z",
+                },
+            ],
+            "thread_id": "Thread-1",
+            "execution_time": 3.5,
+            "adapter_response": {"rows_affected": 10},
+            "message": "SELECT 10",
+            "failures": None,
+            "unique_id": "model.shop.orders",
+            "compiled_code": "select * from raw.orders",
+        },
+        {
+            "status": "fail",
+            "timing": [],
+            "thread_id": "Thread-2",
+            "execution_time": 0.25,
+            "failures": 2,
+            "unique_id": "test.shop.not_null_orders_id",
+        },
+    ],
+    "elapsed_time": 4.0,
+    "args": {"which": "build"},
+}
+
+
+def test_iter_manifest_nodes():
+    """Nodes, sources and exposures become compact records."""
+    fileobj = io.BytesIO(json.dumps(MANIFEST).encode())
+
+    assert list(iter_manifest_nodes(fileobj)) == [
+        {
+            "unique_id": "model.shop.orders",
+            "resource_type": "model",
+            "package_name": "shop",
+            "name": "orders",
+            "original_file_path": "models/orders.sql",
+            "checksum": "abc",
+            "depends_on": ["source.shop.raw.orders"],
+            "config": {"materialized": "table", "tags": ["daily"]},
+        },
+        {
+            "unique_id": "source.shop.raw.orders",
+            "resource_type": "source",
+            "package_name": None,
+            "name": None,
+            "original_file_path": None,
+            "checksum": None,
+            "depends_on": None,
+            "config": {"enabled": True},
+        },
+        {
+            "unique_id": "exposure.shop.dashboard",
+            "resource_type": "exposure",
+            "package_name": None,
+            "name": None,
+            "original_file_path": None,
+            "checksum": None,
+            "depends_on": ["model.shop.orders"],
+            "config": None,
+        },
+    ]
+
+
+def test_iter_run_results():
+    """Each node result becomes a record without its compiled code."""
+    fileobj = io.BytesIO(json.dumps(RUN_RESULTS).encode())
+
+    assert list(iter_run_results(fileobj)) == [
+        {
+            "unique_id": "model.shop.orders",
+            "status": "success",
+            "execution_time": Decimal("3.5"),
+            "thread_id": "Thread-1",
+            "failures": None,
+            "timing": RUN_RESULTS["results"][0]["timing"],
+        },
+        {
+            "unique_id": "test.shop.not_null_orders_id",
+            "status": "fail",
+            "execution_time": Decimal("0.25"),
+            "thread_id": "Thread-2",
+            "failures": 2,
+            "timing": [],
+        },
+    ]
+
+
+def _sync_runs(
+    capsys: pytest.CaptureFixture[str],
+    stream_name: str,
+    runs: list[dict[str, Any]],
+    state: dict[str, Any] | None = None,
+    **config: Any,  # noqa: ANN401
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    tap = TapDBT(
+        config={"api_key": "abc123", "account_ids": ["1000"], **config},
+        state=state,
+    )
+    for stream in tap.streams.values():
+        stream.selected = stream.name in {"runs", stream_name}
+
+    responses.get(f"{API_URL}/runs", json={"data": runs})
+    responses.get(f"{API_URL}/runs", json={"data": []})
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [
+        m["record"]
+        for m in messages
+        if m["type"] == "RECORD" and m["stream"] == stream_name
+    ]
+    states = [m["value"] for m in messages if m["type"] == "STATE"]
+    return records, states[-1]
+
+
+@responses.activate
+def test_manifest_nodes_stream(capsys: pytest.CaptureFixture[str]):
+    """Manifests are only downloaded for runs with saved artifacts."""
+    runs = [
+        {"id": 1, "artifacts_saved": True, "finished_at": "2024-01-01T00:00:00Z"},
+        {"id": 2, "artifacts_saved": False, "finished_at": "2024-01-02T00:00:00Z"},
+        {"id": 3, "artifacts_saved": True, "finished_at": "2024-01-03T00:00:00Z"},
+    ]
+    responses.get(f"{API_URL}/runs/1/artifacts/manifest.json", json=MANIFEST)
+    responses.get(f"{API_URL}/runs/3/artifacts/manifest.json", status=404)
+
+    records, _ = _sync_runs(capsys, "manifest_nodes", runs)
+
+    assert [(r["run_id"], r["unique_id"]) for r in records] == [
+        (1, "model.shop.orders"),
+        (1, "source.shop.raw.orders"),
+        (1, "exposure.shop.dashboard"),
+    ]
+    assert all(r["account_id"] == "1000" for r in records)
+    assert not [c for c in responses.calls if "/runs/2/" in c.request.url]
+
+
+@responses.activate
+def test_run_results_stream(capsys: pytest.CaptureFixture[str]):
+    """Runs whose results were already processed are not downloaded again."""
+    runs = [
+        {
+            "id": run_id,
+            "job_definition_id": job_id,
+            "artifacts_saved": True,
+            "finished_at": f"2024-01-0{run_id}T00:00:00+00:00",
+        }
+        for run_id, job_id in ((1, 10), (2, 20), (3, 10))
+    ]
+    for run in runs:
+        responses.get(
+            f"{API_URL}/runs/{run['id']}/artifacts/run_results.json",
+            json=RUN_RESULTS,
+        )
+
+    records, state = _sync_runs(capsys, "run_results", runs[:2])
+
+    assert [(r["run_id"], r["job_definition_id"], r["unique_id"]) for r in records] == [
+        (1, 10, "model.shop.orders"),
+        (1, 10, "test.shop.not_null_orders_id"),
+        (2, 20, "model.shop.orders"),
+        (2, 20, "test.shop.not_null_orders_id"),
+    ]
+    assert records[0]["execution_time"] == 3.5  # noqa: PLR2004
+    assert [
+        (p["context"]["job_definition_id"], p["last_run_id"])
+        for p in state["bookmarks"]["run_results"]["partitions"]
+    ] == [(10, 1), (20, 2)]
+
+    # The next sync starts at the last run of the first one: only the new run is
+    # downloaded
+    responses.calls.reset()
+    records, state = _sync_runs(capsys, "run_results", runs[1:], state=state)
+
+    assert {r["run_id"] for r in records} == {3}
+    downloads = [
+        c.request.url for c in responses.calls if "/artifacts/" in c.request.url
+    ]
+    assert downloads == [f"{API_URL}/runs/3/artifacts/run_results.json"]
+    assert [
+        (p["context"]["job_definition_id"], p["last_run_id"])
+        for p in state["bookmarks"]["run_results"]["partitions"]
+    ] == [(10, 3), (20, 2)]
+
+
+@responses.activate
+def test_skip_unchanged_manifests(capsys: pytest.CaptureFixture[str]):
+    """Runs of a job with an unchanged manifest only reference the earlier run."""
+    runs = [
+        {
+            "id": run_id,
+            "job_definition_id": 10,
+            "artifacts_saved": True,
+            "finished_at": f"2024-01-0{run_id}T00:00:00+00:00",
+        }
+        for run_id in (1, 2, 3)
+    ]
+    changed = copy.deepcopy(MANIFEST)
+    changed["nodes"]["model.shop.orders"]["checksum"]["checksum"] = "def"
+    for run_id, manifest in ((1, MANIFEST), (2, MANIFEST), (3, changed)):
+        responses.get(
+            f"{API_URL}/runs/{run_id}/artifacts/manifest.json",
+            # Invocation metadata differs between runs
+            json={**manifest, "metadata": {"invocation_id": str(run_id)}},
+        )
+
+    records, state = _sync_runs(
+        capsys,
+        "manifest_nodes",
+        runs,
+        skip_unchanged_manifests=True,
+    )
+
+    assert [(r["run_id"], r["unique_id"]) for r in records] == [
+        (1, "model.shop.orders"),
+        (1, "source.shop.raw.orders"),
+        (1, "exposure.shop.dashboard"),
+        (2, "manifest"),
+        (3, "model.shop.orders"),
+        (3, "source.shop.raw.orders"),
+        (3, "exposure.shop.dashboard"),
+    ]
+    assert records[3]["same_as_run_id"] == 1
+    assert records[3]["resource_type"] == "manifest"
+    (partition,) = state["bookmarks"]["manifest_nodes"]["partitions"]
+    assert partition["manifest_run_id"] == 3  # noqa: PLR2004
+
+
+@responses.activate
+def test_run_artifacts_listed_once(capsys: pytest.CaptureFixture[str]):
+    """Runs emitted again by an overlapping sync are not listed again."""
+    runs = [
+        {"id": run_id, "artifacts_saved": True, "finished_at": finished_at}
+        for run_id, finished_at in (
+            (1, "2024-01-01T00:00:00+00:00"),
+            (2, "2024-01-02T00:00:00+00:00"),
+            (3, "2024-01-02T00:00:00+00:00"),
+            (4, "2024-01-03T00:00:00+00:00"),
+        )
+    ]
+    for run in runs:
+        responses.get(
+            f"{API_URL}/runs/{run['id']}/artifacts",
+            json={"data": ["manifest.json"]},
+        )
+
+    records, state = _sync_runs(capsys, "run_artifacts", runs[:2])
+    assert [r["run_id"] for r in records] == [1, 2]
+
+    # Run 3 finished at the same time as run 2, which the next sync starts from
+    responses.calls.reset()
+    records, state = _sync_runs(capsys, "run_artifacts", runs[1:], state=state)
+
+    assert [r["run_id"] for r in records] == [3, 4]
+    listings = [
+        c.request.url.split("?")[0]
+        for c in responses.calls
+        if "/artifacts" in c.request.url
+    ]
+    assert listings == [f"{API_URL}/runs/{run_id}/artifacts" for run_id in (3, 4)]
+    (partition,) = state["bookmarks"]["run_artifacts"]["partitions"]
+    assert partition["last_finished_at"] == "2024-01-03T00:00:00+00:00"
+    assert partition["run_ids"] == [4]
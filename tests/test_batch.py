@@ -0,0 +1,169 @@
+"""Tests for BATCH message output."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import urllib.parse
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import responses
+
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    from singer_sdk.helpers.types import Record
+
+API_URL = "https://cloud.getdbt.com/api/v2/accounts"
+RUNS = [
+    {
+        "id": run_id,
+        "artifacts_saved": True,
+        "finished_at": f"2024-01-0{run_id}T00:00:00+00:00",
+    }
+    for run_id in range(1, 6)
+]
+ARTIFACTS = [
+    {"account_id": "1000", "run_id": run["id"], "path": path}
+    for run in RUNS
+    for path in ("manifest.json", "run_results.json")
+]
+
+
+def _read_batch(url: str) -> list[Record]:
+    path = Path(urllib.parse.urlsplit(url).path)
+    if ".parquet" in path.name:
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        return pq.read_table(path).to_pylist()  # type: ignore[no-any-return]
+    with gzip.open(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+def _sync(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    encoding: str = "jsonl",
+    batch_size: int = 2,
+    account_ids: tuple[str, ...] = ("1000",),
+    **config: Any,  # noqa: ANN401
+) -> list[dict[str, Any]]:
+    tap = TapDBT(
+        config={
+            "api_key": "abc123",
+            "account_ids": list(account_ids),
+            "batch_config": {
+                "encoding": {"format": encoding, "compression": "gzip"},
+                "storage": {"root": str(tmp_path)},
+                "batch_size": batch_size,
+            },
+            **config,
+        },
+    )
+    for stream in tap.streams.values():
+        stream.selected = stream.name in {"runs", "run_artifacts"}
+
+    envelope = {"data": RUNS, "extra": {"pagination": {"total_count": len(RUNS)}}}
+    for account_id in account_ids:
+        url = f"{API_URL}/{account_id}"
+        responses.get(f"{url}/runs", json=envelope)
+        responses.get(f"{url}/runs", json={**envelope, "data": []})
+        for run in RUNS:
+            responses.get(
+                f"{url}/runs/{run['id']}/artifacts",
+                json={"data": ["manifest.json", "run_results.json"]},
+            )
+
+    tap.sync_all()
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def _batches(messages: list[dict[str, Any]], stream: str) -> list[list[Record]]:
+    return [
+        _read_batch(url)
+        for message in messages
+        if message["type"] == "BATCH" and message["stream"] == stream
+        for url in message["manifest"]
+    ]
+
+
+@responses.activate
+def test_batch_files_are_rotated(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """Records are written to rotated batch files, children before their parents."""
+    messages = _sync(tmp_path, capsys)
+    assert not [m for m in messages if m["type"] == "RECORD"]
+
+    runs = _batches(messages, "runs")
+    artifacts = _batches(messages, "run_artifacts")
+    assert [[r["id"] for r in records] for records in runs] == [[1, 2], [3, 4], [5]]
+    assert [len(records) for records in artifacts] == [2, 2, 2, 2, 2]
+    assert [r for records in artifacts for r in records] == ARTIFACTS
+
+    # The artifacts of the first two runs are in batch files before the first
+    # runs batch, and no state is written before it
+    kinds = [(m["type"], m.get("stream")) for m in messages if m["type"] != "SCHEMA"]
+    first_runs_batch = kinds.index(("BATCH", "runs"))
+    assert kinds[:first_runs_batch].count(("BATCH", "run_artifacts")) == 2  # noqa: PLR2004
+    assert ("STATE", None) not in kinds[:first_runs_batch]
+
+
+@responses.activate
+def test_batch_files_rotated_by_size(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+):
+    """Batch files are also rotated once they reach the configured size."""
+    messages = _sync(tmp_path, capsys, batch_size=1000, batch_file_max_bytes=1)
+
+    assert [len(records) for records in _batches(messages, "runs")] == [1] * 5
+    assert len(_batches(messages, "run_artifacts")) == len(ARTIFACTS)
+
+
+@responses.activate
+def test_parquet_batch_files(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """Batch files can be written as Parquet."""
+    pytest.importorskip("pyarrow")
+    messages = _sync(tmp_path, capsys, encoding="parquet", batch_size=4)
+
+    assert [
+        r for records in _batches(messages, "run_artifacts") for r in records
+    ] == ARTIFACTS
+    assert [len(records) for records in _batches(messages, "runs")] == [4, 1]
+
+
+@responses.activate
+def test_batch_state_never_ahead_of_artifacts(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+):
+    """No STATE bookmarks a run whose artifacts are still in an open batch file."""
+    messages = _sync(tmp_path, capsys, batch_size=3, account_ids=("1000", "2000"))
+
+    written: set[tuple[str, int]] = set()
+    bookmarks: dict[str, str] = {}
+    for message in messages:
+        if message["type"] == "BATCH" and message["stream"] == "run_artifacts":
+            written.update(
+                (record["account_id"], record["run_id"])
+                for url in message["manifest"]
+                for record in _read_batch(url)
+            )
+        elif message["type"] == "STATE":
+            runs_state = message["value"]["bookmarks"].get("runs", {})
+            for partition in runs_state.get("partitions", []):
+                account_id = partition["context"]["account_id"]
+                bookmark = partition.get("replication_key_value")
+                if bookmark is None:
+                    continue
+                bookmarks[account_id] = bookmark
+                assert {
+                    (account_id, run["id"])
+                    for run in RUNS
+                    if run["finished_at"] <= bookmark
+                } <= written
+
+    # Both accounts were bookmarked, so the check above covered them
+    assert set(bookmarks) == {"1000", "2000"}
+    assert len(written) == 2 * len(RUNS)
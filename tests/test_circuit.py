@@ -0,0 +1,92 @@
+"""Tests for the per-account circuit breaker."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+import requests
+import responses
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+
+from tap_dbt.circuit import AccountCircuitOpenError, CircuitBreaker
+from tap_dbt.tap import TapDBT
+
+API_URL = "https://cloud.getdbt.com/api/v2/accounts"
+STREAMS = ("connections", "environments", "repositories")
+
+
+def _retriable(status: int) -> RetriableAPIError:
+    response = requests.Response()
+    response.status_code = status
+    return RetriableAPIError(f"{status} error", response)
+
+
+def test_circuit_breaker():
+    """Circuits open after consecutive failures, and successes reset the count."""
+    breaker = CircuitBreaker(threshold=2)
+
+    assert not breaker.record_failure("1000", _retriable(503))
+    breaker.record_success("1000")
+    assert not breaker.record_failure("1000", _retriable(503))
+    # Rate limiting is not a failure of the account
+    assert not breaker.record_failure("1000", _retriable(429))
+    assert not breaker.is_open("1000")
+
+    assert breaker.record_failure("1000", FatalAPIError("401 Unauthorized"))
+    assert breaker.is_open("1000")
+    assert not breaker.is_open("2000")
+    with pytest.raises(AccountCircuitOpenError, match="401 Unauthorized"):
+        breaker.check("1000")
+
+
+def test_disabled_circuit_breaker():
+    """A threshold of 0 never opens circuits."""
+    breaker = CircuitBreaker(threshold=0)
+    for _ in range(10):
+        breaker.record_failure("1000", _retriable(503))
+    assert not breaker.is_open("1000")
+
+
+def _sync(
+    capsys: pytest.CaptureFixture[str],
+    **config: Any,  # noqa: ANN401
+) -> list[dict[str, Any]]:
+    tap = TapDBT(
+        config={"api_key": "abc123", "account_ids": ["1000", "2000"], **config},
+    )
+    for stream in tap.streams.values():
+        stream.selected = stream.name in STREAMS
+
+    for stream in STREAMS:
+        responses.get(f"{API_URL}/1000/{stream}", status=401)
+        responses.get(f"{API_URL}/2000/{stream}", json={"data": [{"id": 1}]})
+        responses.get(f"{API_URL}/2000/{stream}", json={"data": []})
+
+    tap.sync_all()
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+@responses.activate
+def test_failing_account_is_skipped(capsys: pytest.CaptureFixture[str]):
+    """Once the circuit of an account opens, its remaining partitions are skipped."""
+    messages = _sync(capsys, circuit_breaker_threshold=2)
+
+    records = [m for m in messages if m["type"] == "RECORD"]
+    assert [(r["stream"], r["record"]["id"]) for r in records] == [
+        (stream, 1) for stream in STREAMS
+    ]
+
+    # Connections and environments failed once each, which opened the circuit, so
+    # repositories were not requested for the failing account
+    failed = [c.request.url for c in responses.calls if "/1000/" in c.request.url]
+    assert len(failed) == 2  # noqa: PLR2004
+    assert not [url for url in failed if "repositories" in url]
+
+
+@responses.activate
+def test_circuit_breaker_disabled(capsys: pytest.CaptureFixture[str]):
+    """Without a threshold, the first failing account fails the sync."""
+    with pytest.raises(FatalAPIError):
+        _sync(capsys, circuit_breaker_threshold=0)
@@ -0,0 +1,138 @@
+"""Tests for the concurrency helpers."""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+import responses
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_dbt.concurrency import ordered_chain
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from requests import PreparedRequest
+
+
+def test_ordered_chain():
+    """Items are produced concurrently and consumed in order."""
+    started: list[int] = []
+    all_started = threading.Barrier(3, timeout=5)
+
+    def produce(item: int) -> Iterator[tuple[int, int]]:
+        started.append(item)
+        if item < 3:  # noqa: PLR2004
+            # Only returns once the first three items are all being produced
+            all_started.wait()
+        for index in range(5):
+            yield item, index
+
+    results = [
+        (item, list(results))
+        for item, results in ordered_chain(produce, range(5), 3, buffer_size=2)
+    ]
+
+    assert results == [(item, [(item, i) for i in range(5)]) for item in range(5)]
+    assert sorted(started) == list(range(5))
+
+
+def test_ordered_chain_error():
+    """Errors are raised when the consumer reaches them."""
+
+    def produce(item: int) -> Iterator[int]:
+        if item == 1:
+            msg = "boom"
+            raise ValueError(msg)
+        yield item
+
+    chain = ordered_chain(produce, range(3), 2, buffer_size=1)
+    _, results = next(chain)
+    assert list(results) == [0]
+
+    _, results = next(chain)
+    with pytest.raises(ValueError, match="boom"):
+        list(results)
+    chain.close()
+
+
+@responses.activate
+def test_concurrent_streams(capsys: pytest.CaptureFixture[str]):
+    """Top-level streams are synced at once, with their messages interleaved."""
+    streams = ("connections", "environments", "repositories")
+    both_requested = threading.Barrier(len(streams), timeout=5)
+
+    def callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+        if "offset" not in str(request.url):
+            # Only returns once every stream sent its first request
+            both_requested.wait()
+            data = [{"id": 1}, {"id": 2}]
+        else:
+            data = []
+        return 200, {}, json.dumps({"data": data})
+
+    for stream in streams:
+        responses.add_callback(
+            responses.GET,
+            f"https://cloud.getdbt.com/api/v2/accounts/1000/{stream}",
+            callback=callback,
+        )
+
+    tap = TapDBT(
+        config={
+            "api_key": "abc123",
+            "account_ids": ["1000"],
+            "page_size": 2,
+            "concurrent_streams": 3,
+        },
+    )
+    for stream in tap.streams.values():
+        stream.selected = stream.name in streams
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    seen_schemas: set[str] = set()
+    for message in messages:
+        if message["type"] == "SCHEMA":
+            seen_schemas.add(message["stream"])
+        elif message["type"] == "RECORD":
+            assert message["stream"] in seen_schemas
+    assert sorted(
+        (m["stream"], m["record"]["id"]) for m in messages if m["type"] == "RECORD"
+    ) == [(stream, record_id) for stream in streams for record_id in (1, 2)]
+
+    state = messages[-1]["value"]["bookmarks"]
+    assert all(
+        state[stream]["partitions"] == [{"context": {"account_id": "1000"}}]
+        for stream in streams
+    )
+
+
+@responses.activate
+def test_concurrent_streams_failure():
+    """A failing stream fails the sync once the other streams stopped."""
+    responses.get(
+        "https://cloud.getdbt.com/api/v2/accounts/1000/connections",
+        status=401,
+    )
+    responses.get(
+        "https://cloud.getdbt.com/api/v2/accounts/1000/environments",
+        json={"data": []},
+    )
+    tap = TapDBT(
+        config={
+            "api_key": "abc123",
+            "account_ids": ["1000"],
+            "concurrent_streams": 2,
+            "circuit_breaker_threshold": 0,
+        },
+    )
+    for stream in tap.streams.values():
+        stream.selected = stream.name in {"connections", "environments"}
+
+    with pytest.raises(FatalAPIError):
+        tap.sync_all()
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Any
 
 import pytest
 import responses
+from responses import matchers
 from singer_sdk.testing import get_standard_tap_tests
 
 from tap_dbt.streams import GroupsStream, RunsStream
@@ -342,6 +343,51 @@ def projects_response():
     }
 
 
+@pytest.fixture
+def credentials_response():
+    """Return a sample response for the credentials stream."""
+    return {
+        "status": {
+            "code": 200,
+            "is_success": True,
+        },
+        "data": [
+            {
+                "id": 1,
+                "account_id": 1000,
+                "project_id": 1000,
+                "type": "snowflake",
+                "state": 1,
+                "threads": 4,
+                "_private_key": "secret",
+            },
+        ],
+        "extra": {
+            "pagination": {
+                "count": 1,
+                "total_count": 1,
+            },
+        },
+    }
+
+
+@pytest.fixture
+def environment_variables_response():
+    """Return a sample response for the environment variables endpoints."""
+    return {
+        "status": {
+            "code": 200,
+            "is_success": True,
+        },
+        "data": {
+            "DBT_TARGET_SCHEMA": {
+                "project": {"id": 1, "value": "analytics"},
+                "Production": {"id": 2, "value": "prod"},
+            },
+        },
+    }
+
+
 @pytest.fixture
 def repositories_response(faker: Faker):
     """Return a sample response for the repositories stream."""
@@ -575,6 +621,8 @@ def test_standard_tap_tests(  # noqa: PLR0913
     accounts_response: dict,
     audit_logs_response: dict,
     connections_response: dict,
+    credentials_response: dict,
+    environment_variables_response: dict,
     environments_response: dict,
     groups_response: dict,
     jobs_response: dict,
@@ -615,6 +663,16 @@ def test_standard_tap_tests(  # noqa: PLR0913
         status=200,
     )
 
+    responses.add(
+        responses.GET,
+        re.compile(
+            "https://cloud.getdbt.com/api/v3/accounts/1000/projects/\\d+/"
+            "environment-variables/(environment|job|user)/"
+        ),
+        json=environment_variables_response,
+        status=200,
+    )
+
     responses.add(
         responses.GET,
         "https://cloud.getdbt.com/api/v3/accounts/1000/groups",
@@ -627,6 +685,16 @@ def test_standard_tap_tests(  # noqa: PLR0913
         "https://cloud.getdbt.com/api/v2/accounts/1000/jobs",
         json=jobs_response,
         status=200,
+        match=[matchers.query_param_matcher({"limit": 5000})],
+    )
+
+    # Jobs are also read in full, through the job index
+    responses.add(
+        responses.GET,
+        "https://cloud.getdbt.com/api/v2/accounts/1000/jobs",
+        json={**jobs_response, "data": []},
+        status=200,
+        match=[matchers.query_param_matcher({"limit": 5000, "offset": 5000})],
     )
 
     responses.add(
@@ -634,6 +702,36 @@ def test_standard_tap_tests(  # noqa: PLR0913
         "https://cloud.getdbt.com/api/v2/accounts/1000/projects",
         json=projects_response,
         status=200,
+        match=[matchers.query_param_matcher({"limit": 5000})],
+    )
+
+    # The projects of an account are requested in full to fan out over them
+    responses.add(
+        responses.GET,
+        "https://cloud.getdbt.com/api/v2/accounts/1000/projects",
+        json={**projects_response, "data": []},
+        status=200,
+        match=[matchers.query_param_matcher({"limit": 5000, "offset": 5000})],
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(
+            "https://cloud.getdbt.com/api/v3/accounts/1000/projects/\\d+/credentials/"
+        ),
+        json=credentials_response,
+        status=200,
+        match=[matchers.query_param_matcher({"limit": 5000})],
+    )
+
+    responses.add(
+        responses.GET,
+        re.compile(
+            "https://cloud.getdbt.com/api/v3/accounts/1000/projects/\\d+/credentials/"
+        ),
+        json={**credentials_response, "data": []},
+        status=200,
+        match=[matchers.query_param_matcher({"limit": 5000, "offset": 5000})],
     )
 
     responses.add(
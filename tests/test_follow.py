@@ -0,0 +1,83 @@
+"""Tests for following the runs stream."""
+
+from __future__ import annotations
+
+import json
+import urllib.parse
+from typing import TYPE_CHECKING, Any, cast
+
+import responses
+
+from tap_dbt.follow import RunsFollower
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    import pytest
+    from requests import PreparedRequest
+
+    from tap_dbt.streams import RunsStream
+
+URL = "https://cloud.getdbt.com/api/v2/accounts/1000/runs"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@responses.activate
+def test_follow_runs(capsys: pytest.CaptureFixture[str]):
+    """Runs are emitted once as they finish, and idle accounts are polled less."""
+    clock = _Clock()
+    finished = [{"id": 1, "finished_at": "2024-01-01T00:00:00+00:00"}]
+    polls: list[float] = []
+
+    def callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.url).query))
+        if "offset" in params:
+            return 200, {}, json.dumps({"data": []})
+
+        polls.append(clock.now)
+        if clock.now >= 20:  # noqa: PLR2004
+            finished[1:] = [{"id": 2, "finished_at": "2024-01-02T00:00:00+00:00"}]
+        start = json.loads(params.get("finished_at__range", '[""]'))[0]
+        runs = [
+            {**run, "status": 10, "artifacts_saved": False}
+            for run in finished
+            if run["finished_at"][:19] >= start
+        ]
+        return 200, {}, json.dumps({"data": runs})
+
+    responses.add_callback(responses.GET, URL, callback=callback)
+    tap = TapDBT(config={"api_key": "abc123", "account_ids": ["1000"]})
+    for stream in tap.streams.values():
+        stream.selected = stream.name == "runs"
+    tap.sync_all()
+
+    RunsFollower(
+        cast("RunsStream", tap.streams["runs"]),
+        min_interval=5,
+        max_interval=20,
+        duration=60,
+        clock=clock,
+        sleep=clock.sleep,
+    ).run()
+
+    # Idle polls back off, and the poll finding run 2 resets the interval
+    assert polls == [0, 5, 15, 35, 40, 50]
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"]["id"] for m in messages if m["type"] == "RECORD"]
+    assert records == [1, 2]
+
+    states: list[dict[str, Any]] = [
+        m["value"] for m in messages if m["type"] == "STATE"
+    ]
+    (partition,) = states[-1]["bookmarks"]["runs"]["partitions"]
+    assert partition["replication_key_value"] == "2024-01-02T00:00:00+00:00"
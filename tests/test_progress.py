@@ -0,0 +1,110 @@
+"""Tests for progress reports."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import TYPE_CHECKING
+
+import responses
+
+from tap_dbt.progress import ProgressReporter
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    import pytest
+
+LOGGER = logging.getLogger("tap-dbt.test")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_progress_reports(caplog: pytest.LogCaptureFixture):
+    """Progress is reported once per interval, and when a reported request ends."""
+    clock = _Clock()
+    reporter = ProgressReporter(interval=10, clock=clock)
+    context = {"account_id": "1000"}
+    caplog.set_level(logging.INFO)
+
+    reporter.update(LOGGER, "runs", context, 0, 100, 400)
+    clock.now = 5
+    reporter.update(LOGGER, "runs", context, 100, 100, 400)
+    assert not caplog.records
+
+    clock.now = 10
+    reporter.update(LOGGER, "runs", context, 200, 100, 400)
+    progress, metric = (record.getMessage() for record in caplog.records)
+    assert progress == (
+        "Progress of stream 'runs' for {'account_id': '1000'}: 300 of 400 records "
+        "(75.0%), 30.0 records/s, ETA 0:00:03"
+    )
+    point = json.loads(metric.removeprefix("METRIC: "))
+    assert point["metric"] == "sync_progress"
+    assert point["value"] == 300  # noqa: PLR2004
+    assert point["tags"]["eta_seconds"] == 100 / 30
+
+    caplog.clear()
+    clock.now = 12
+    reporter.update(LOGGER, "runs", context, 300, 100, 400)
+    assert "400 of 400 records (100.0%)" in caplog.records[0].getMessage()
+
+
+def test_quick_requests_not_reported(caplog: pytest.LogCaptureFixture):
+    """Requests that end within the interval, or without a total, are not reported."""
+    clock = _Clock()
+    reporter = ProgressReporter(interval=10, clock=clock)
+    caplog.set_level(logging.INFO)
+
+    reporter.update(LOGGER, "jobs", {"account_id": "1000"}, 0, 5, 5)
+    clock.now = 20
+    reporter.update(LOGGER, "jobs", {"account_id": "1000"}, 0, 5, None)
+    assert not caplog.records
+
+    disabled = ProgressReporter(interval=0, clock=clock)
+    disabled.update(LOGGER, "jobs", {"account_id": "1000"}, 0, 5, 10)
+    clock.now = 40
+    disabled.update(LOGGER, "jobs", {"account_id": "1000"}, 5, 5, 10)
+    assert not caplog.records
+
+
+@responses.activate
+def test_progress_of_stream(monkeypatch: pytest.MonkeyPatch):
+    """Streams report the pages they fetch, without an extra request."""
+    updates: list[tuple[str, int, int, int | None]] = []
+
+    def update(  # noqa: PLR0913, PLR0917
+        self: ProgressReporter,  # noqa: ARG001
+        logger: logging.Logger,  # noqa: ARG001
+        stream: str,
+        context: dict[str, str] | None,  # noqa: ARG001
+        offset: int,
+        count: int,
+        total: int | None,
+    ) -> None:
+        updates.append((stream, offset, count, total))
+
+    monkeypatch.setattr(ProgressReporter, "update", update)
+    url = "https://cloud.getdbt.com/api/v2/accounts/1000/users"
+    for offset, page in ((0, [{"id": 1}, {"id": 2}]), (2, [{"id": 3}]), (4, [])):
+        responses.get(
+            url,
+            json={"data": page, "extra": {"pagination": {"total_count": 3}}},
+            match=[
+                responses.matchers.query_param_matcher(
+                    {"limit": 2, "offset": offset} if offset else {"limit": 2}
+                )
+            ],
+        )
+
+    tap = TapDBT(config={"api_key": "abc123", "account_ids": ["1000"], "page_size": 2})
+    stream = tap.streams["users"]
+    assert len(list(stream.get_records({"account_id": "1000"}))) == 3  # noqa: PLR2004
+
+    assert updates == [("users", 0, 2, 3), ("users", 2, 1, 3), ("users", 4, 0, 3)]
+    assert len(responses.calls) == 3  # noqa: PLR2004
@@ -0,0 +1,110 @@
+"""Tests for the response cache."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, Any
+
+import requests
+import responses
+
+from tap_dbt.response_cache import ResponseCache, response_cache_key
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+URL = "https://cloud.getdbt.com/api/v2/accounts/1000/repositories"
+
+
+def _get(token: str = "abc123", **params: Any) -> requests.Response:  # noqa: ANN401, S107
+    with responses.RequestsMock() as mock:
+        mock.get(URL, json={"data": [{"id": 1}]})
+        return requests.get(
+            URL,
+            params=params,
+            headers={"Authorization": f"Token {token}"},
+            timeout=5,
+        )
+
+
+def test_response_cache_key():
+    """Keys ignore the order of query parameters, but not the API token."""
+    first = _get(limit=2, offset=0).request
+    assert response_cache_key(first) == response_cache_key(
+        _get(offset=0, limit=2).request,
+    )
+    assert response_cache_key(first) != response_cache_key(_get(limit=3).request)
+    assert response_cache_key(first) != response_cache_key(
+        _get("other", limit=2, offset=0).request,
+    )
+    assert "abc123" not in response_cache_key(first)
+
+
+def test_response_cache(tmp_path: Path):
+    """Responses are served until their TTL, and never for another token."""
+    now = 1_000_000.0
+    cache = ResponseCache(tmp_path, clock=lambda: now)
+    response = _get()
+    cache.put(response)
+    (entry,) = tmp_path.iterdir()
+    os.utime(entry, (now - 10, now - 10))
+
+    cached = cache.get(response.request, ttl=60)
+    assert cached is not None
+    assert cached.json() == {"data": [{"id": 1}]}
+    assert cached.headers["Content-Type"] == "application/json"
+
+    assert cache.get(response.request, ttl=5) is None
+    assert cache.get(_get("other").request, ttl=60) is None
+
+
+def test_response_cache_eviction(tmp_path: Path):
+    """The oldest entries are removed once the cache exceeds its size."""
+    cache = ResponseCache(tmp_path)
+    cache.put(_get(limit=1))
+    (first,) = tmp_path.iterdir()
+    os.utime(first, (0, 0))
+
+    cache.max_bytes = first.stat().st_size * 2
+    cache.put(_get(limit=2))
+    assert len(list(tmp_path.iterdir())) == 2  # noqa: PLR2004
+
+    cache.put(_get(limit=3))
+    assert first not in list(tmp_path.iterdir())
+    assert len(list(tmp_path.iterdir())) == 2  # noqa: PLR2004
+
+
+def _sync(capsys: pytest.CaptureFixture[str], **config: Any) -> list[int]:  # noqa: ANN401
+    tap = TapDBT(config={"api_key": "abc123", "account_ids": ["1000"], **config})
+    for stream in tap.streams.values():
+        stream.selected = stream.name == "repositories"
+    tap.sync_all()
+
+    return [
+        json.loads(line)["record"]["id"]
+        for line in capsys.readouterr().out.splitlines()
+        if json.loads(line)["type"] == "RECORD"
+    ]
+
+
+@responses.activate
+def test_cached_sync(capsys: pytest.CaptureFixture[str], tmp_path: Path):
+    """A second sync within the TTL sends no requests."""
+    responses.get(URL, json={"data": [{"id": 1}, {"id": 2}]})
+    responses.get(URL, json={"data": []})
+    config = {"response_cache": True, "response_cache_dir": str(tmp_path)}
+
+    assert _sync(capsys, **config) == [1, 2]
+    calls = len(responses.calls)
+    assert _sync(capsys, **config) == [1, 2]
+    assert len(responses.calls) == calls
+
+    responses.reset()
+    responses.get(URL, json={"data": [{"id": 1}, {"id": 2}]})
+    responses.get(URL, json={"data": []})
+    assert _sync(capsys, **config, response_cache_ttls={"repositories": 0}) == [1, 2]
+    assert len(responses.calls) == 2  # noqa: PLR2004
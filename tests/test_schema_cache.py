@@ -0,0 +1,53 @@
+"""Tests for the on-disk schema cache."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from tap_dbt.schema_cache import SchemaCache, cache_key, get_schema_cache
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SCHEMA = {"type": "object", "properties": {"id": {"type": "integer"}}}
+
+
+def _fail() -> dict[str, Any]:
+    pytest.fail("The schema was generated again")
+
+
+def test_schema_cache(tmp_path: Path):
+    """Schemas are generated once and read back by later processes."""
+    stale = tmp_path / "schemas-0.1.0-0000000000000000.json"
+    stale.write_text("{}")
+
+    assert SchemaCache(tmp_path, "key").get("runs", lambda: SCHEMA) == SCHEMA
+    assert SchemaCache(tmp_path, "key").get("runs", _fail) == SCHEMA
+    assert not stale.exists()
+
+    # Another key, e.g. after an upgrade, does not read these schemas
+    assert SchemaCache(tmp_path, "other").get("runs", dict) == {}
+
+
+def test_corrupt_schema_cache(tmp_path: Path):
+    """A file that cannot be read is ignored and replaced."""
+    (tmp_path / "schemas-key.json").write_text('{"runs": ')
+
+    assert SchemaCache(tmp_path, "key").get("runs", lambda: SCHEMA) == SCHEMA
+    assert SchemaCache(tmp_path, "key").get("runs", _fail) == SCHEMA
+
+
+def test_cached_catalog(tmp_path: Path):
+    """The catalog of a tap is the same with or without the cache."""
+    config = {"api_key": "abc123", "account_ids": ["1000"]}
+    uncached = TapDBT(config={**config, "schema_cache": False}).catalog_dict
+    generated = TapDBT(config={**config, "schema_cache_dir": str(tmp_path)})
+    assert generated.catalog_dict == uncached
+    assert (tmp_path / f"schemas-{cache_key()}.json").exists()
+
+    cached = TapDBT(config={**config, "schema_cache_dir": str(tmp_path)})
+    assert cached.catalog_dict == uncached
+    assert get_schema_cache({"schema_cache": False}) is None
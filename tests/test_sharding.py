@@ -0,0 +1,170 @@
+"""Tests for account sharding."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+import responses
+
+from tap_dbt.sharding import merge_shard_states, shard_for_account
+from tap_dbt.streams import JobsStream
+from tap_dbt.tap import TapDBT
+
+ACCOUNT_IDS = [str(account_id) for account_id in range(1000, 1100)]
+
+
+def _partitions(shard_index: int, shard_count: int) -> list[dict]:
+    tap = TapDBT(
+        config={
+            "api_key": "test-api-key",
+            "account_ids": ACCOUNT_IDS,
+            "shard_index": shard_index,
+            "shard_count": shard_count,
+        },
+    )
+    return JobsStream(tap).partitions
+
+
+def test_shards_partition_accounts():
+    """Every account is owned by exactly one shard."""
+    shards = [_partitions(shard_index, 4) for shard_index in range(4)]
+    owned = [partition["account_id"] for shard in shards for partition in shard]
+
+    assert sorted(owned) == sorted(ACCOUNT_IDS)
+    assert all(len(shard) > 10 for shard in shards)  # noqa: PLR2004
+
+
+def test_shard_assignment_is_stable():
+    """Adding a shard only moves accounts onto the new shard."""
+    for account_id in ACCOUNT_IDS:
+        before = shard_for_account(account_id, 4)
+        after = shard_for_account(account_id, 5)
+        assert after in {before, 4}
+
+
+def test_invalid_shard_config():
+    """The shard index must be lower than the shard count."""
+    with pytest.raises(ValueError, match="Invalid sharding configuration"):
+        _partitions(2, 2)
+
+
+def test_load_state_keeps_own_partitions():
+    """A shard ignores bookmarks of accounts owned by other shards."""
+    state = {
+        "bookmarks": {
+            "runs": {
+                "partitions": [
+                    {
+                        "context": {"account_id": account_id},
+                        "replication_key": "finished_at",
+                        "replication_key_value": "2024-01-01T00:00:00+00:00",
+                    }
+                    for account_id in ACCOUNT_IDS
+                ],
+            },
+        },
+    }
+    tap = TapDBT(
+        config={
+            "api_key": "test-api-key",
+            "account_ids": ACCOUNT_IDS,
+            "shard_index": 1,
+            "shard_count": 3,
+        },
+        state=state,
+    )
+
+    partitions = tap.state["bookmarks"]["runs"]["partitions"]
+    assert partitions
+    assert all(
+        shard_for_account(partition["context"]["account_id"], 3) == 1
+        for partition in partitions
+    )
+
+
+def test_merge_shard_states():
+    """Shard states are merged by partition, keeping the most recent bookmark."""
+    merged = merge_shard_states(
+        [
+            {
+                "bookmarks": {
+                    "runs": {
+                        "partitions": [
+                            {
+                                "context": {"account_id": "1"},
+                                "replication_key": "finished_at",
+                                "replication_key_value": "2024-01-02",
+                            },
+                        ],
+                    },
+                },
+            },
+            {
+                "bookmarks": {
+                    "runs": {
+                        "partitions": [
+                            {
+                                "context": {"account_id": "1"},
+                                "replication_key": "finished_at",
+                                "replication_key_value": "2024-01-01",
+                            },
+                            {
+                                "context": {"account_id": "2"},
+                                "replication_key": "finished_at",
+                                "replication_key_value": "2024-01-03",
+                            },
+                        ],
+                    },
+                },
+            },
+        ],
+    )
+
+    assert merged["bookmarks"]["runs"]["partitions"] == [
+        {
+            "context": {"account_id": "1"},
+            "replication_key": "finished_at",
+            "replication_key_value": "2024-01-02",
+        },
+        {
+            "context": {"account_id": "2"},
+            "replication_key": "finished_at",
+            "replication_key_value": "2024-01-03",
+        },
+    ]
+
+
+def test_load_state_does_not_share_input_state():
+    """Syncing never mutates the state dictionary the tap was started with."""
+    partition = {"context": {"account_id": "1000"}, "replication_key": "finished_at"}
+    state = {"bookmarks": {"runs": {"partitions": [partition]}}}
+    tap = TapDBT(
+        config={"api_key": "test-api-key", "account_ids": ["1000"]},
+        state=state,
+    )
+
+    tap.state["bookmarks"]["runs"]["partitions"][0]["replication_key_value"] = "x"
+    assert "replication_key_value" not in partition
+
+
+@responses.activate
+def test_shard_without_accounts(capsys: pytest.CaptureFixture[str]):
+    """A shard that owns none of the accounts syncs nothing and sends no request."""
+    account_id = "1000"
+    shard_index = 1 - shard_for_account(account_id, 2)
+    tap = TapDBT(
+        config={
+            "api_key": "test-api-key",
+            "account_ids": [account_id],
+            "shard_index": shard_index,
+            "shard_count": 2,
+        },
+    )
+    for stream in tap.streams.values():
+        stream.selected = stream.name != "accounts"
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert not [m for m in messages if m["type"] == "RECORD"]
+    assert not responses.calls
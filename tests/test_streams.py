@@ -0,0 +1,639 @@
+"""Stream behaviour tests."""
+
+from __future__ import annotations
+
+import copy
+import datetime
+import json
+import threading
+import time
+import types
+import urllib.parse
+from typing import TYPE_CHECKING, Any
+
+import responses
+
+from tap_dbt.streams import AuditLogsStream, RunsStream, older_than
+from tap_dbt.tap import TapDBT
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+    from requests import PreparedRequest
+
+API_URL = "https://cloud.getdbt.com/api"
+
+
+def _tap(state: dict[str, Any] | None = None, **config: Any) -> TapDBT:  # noqa: ANN401
+    return TapDBT(
+        config={
+            "api_key": "abc123",
+            "account_ids": ["1000"],
+            **config,
+        },
+        state=state,
+    )
+
+
+def _envelope(data: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "status": {"code": 200, "is_success": True},
+        "data": data,
+        "extra": {"pagination": {"count": len(data), "total_count": len(data)}},
+    }
+
+
+def _add_pages(url: str, *pages: list[dict[str, Any]]) -> None:
+    """Register one response per page, followed by the empty page ending the sync."""
+    for page in (*pages, []):
+        responses.get(url, json=_envelope(page))
+
+
+@responses.activate
+def test_skip_unchanged_records_in_state():
+    """Unchanged records are skipped and removed records become tombstones."""
+    tap = _tap(skip_unchanged_records=True, emit_tombstones=True)
+    stream = tap.streams["repositories"]
+    context = {"account_id": "1000"}
+    url = f"{API_URL}/v2/accounts/1000/repositories"
+
+    _add_pages(url, [{"id": 1, "state": 1}, {"id": 2, "state": 1}])
+    assert [r["id"] for r in stream.get_records(context)] == [1, 2]
+
+    responses.reset()
+    _add_pages(url, [{"id": 1, "state": 1}, {"id": 3, "state": 1}])
+    records = list(stream.get_records(context))
+
+    assert [r["id"] for r in records] == [3, 2]
+    assert "_sdc_deleted_at" not in records[0]
+    assert records[1]["_sdc_deleted_at"]
+    assert "_sdc_deleted_at" in stream.schema["properties"]
+    assert set(stream.get_context_state(context)["fingerprints"]) == {"[1]", "[3]"}
+
+
+@responses.activate
+def test_skip_unchanged_records_in_file(tmp_path: Path):
+    """Fingerprints in a local file are only trusted once their state is committed."""
+    store = tmp_path / "fingerprints.json"
+    context = {"account_id": "1000"}
+    url = f"{API_URL}/v2/accounts/1000/repositories"
+    config = {"skip_unchanged_records": True, "fingerprint_store_path": str(store)}
+
+    _add_pages(url, [{"id": 1, "state": 1}])
+    tap = _tap(**config)
+    assert len(list(tap.streams["repositories"].get_records(context))) == 1
+    assert store.exists()
+    committed_state = copy.deepcopy(tap.state)
+    assert "fingerprints" not in tap.streams["repositories"].get_context_state(context)
+
+    # The record changes, but the target never acknowledges the state of this sync
+    responses.reset()
+    _add_pages(url, [{"id": 1, "state": 2}])
+    tap = _tap(committed_state, **config)
+    assert len(list(tap.streams["repositories"].get_records(context))) == 1
+
+    # Resuming from the last acknowledged state emits the changed record again
+    responses.reset()
+    _add_pages(url, [{"id": 1, "state": 2}])
+    tap = _tap(committed_state, **config)
+    assert len(list(tap.streams["repositories"].get_records(context))) == 1
+    committed_state = copy.deepcopy(tap.state)
+
+    # Once acknowledged, the unchanged record is skipped
+    responses.reset()
+    _add_pages(url, [{"id": 1, "state": 2}])
+    tap = _tap(committed_state, **config)
+    assert list(tap.streams["repositories"].get_records(context)) == []
+
+
+def test_fingerprint_file_per_shard(tmp_path: Path):
+    """Shards sharing a fingerprint store path write to separate files."""
+    store = tmp_path / "fingerprints.json"
+    tap = _tap(
+        fingerprint_store_path=str(store),
+        skip_unchanged_records=True,
+        shard_index=1,
+        shard_count=2,
+    )
+    stream = tap.streams["users"]
+
+    assert stream._fingerprint_file.path == tmp_path / "fingerprints.shard-1.json"  # noqa: SLF001
+
+
+@responses.activate
+def test_audit_logs_windows(capsys: pytest.CaptureFixture[str]):
+    """Audit logs are requested in date windows and bookmarked per account."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    events = [
+        {"id": str(day), "created_at": (now - datetime.timedelta(days=day)).isoformat()}
+        for day in range(100, -1, -10)
+    ]
+    windows: list[tuple[str | None, str | None]] = []
+
+    def audit_logs(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.url).query))
+        start, end = params.get("logged_at_start"), params.get("logged_at_end")
+        if "offset" not in params:
+            windows.append((start, end))
+        data = [
+            event
+            for event in events
+            if (start is None or event["created_at"] >= start)
+            and (end is None or event["created_at"] <= end)
+        ][int(params.get("offset", 0)) :][: int(params["limit"])]
+        return 200, {}, json.dumps(_envelope(data))
+
+    responses.add_callback(
+        responses.GET,
+        "https://cloud.getdbt.com/api/v3/accounts/1000/audit-logs",
+        callback=audit_logs,
+    )
+
+    start_date = (now - datetime.timedelta(days=95)).isoformat()
+    tap = _tap(start_date=start_date, page_size=2)
+    for stream in tap.streams.values():
+        stream.selected = stream.name == "audit_logs"
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    state = [m["value"] for m in messages if m["type"] == "STATE"][-1]
+
+    assert len(windows) == 4  # noqa: PLR2004
+    # Windows are requested concurrently, so they may arrive in any order
+    assert max(windows, key=lambda window: window[0] or "")[1] is None
+    assert [r["id"] for r in records] == [str(day) for day in range(90, -1, -10)]
+    assert state["bookmarks"]["audit_logs"]["partitions"] == [
+        {
+            "context": {"account_id": "1000"},
+            "replication_key": "created_at",
+            "replication_key_value": events[-1]["created_at"],
+        },
+    ]
+
+
+@responses.activate
+def test_audit_logs_bulk_export(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+):
+    """The first sync of an account loads a bulk export, then pages new events."""
+    monkeypatch.setattr(AuditLogsStream, "export_poll_interval", 0)
+    url = "https://cloud.getdbt.com/api/v3/accounts/1000/audit-logs"
+    download_url = "https://exports.example.com/audit-logs.csv?signature=abc"
+
+    responses.post(f"{url}/export/", json={"data": {"job_id": "job-1"}})
+    responses.get(f"{url}/export/", json={"data": {"is_running": True}})
+    responses.get(f"{url}/export/", json={"data": {"is_running": False}})
+    responses.get(
+        f"{url}/export/job-1/download/",
+        json={"data": {"download_url": download_url}},
+    )
+    export = responses.get(
+        download_url,
+        body=(
+            "id,account_id,event_type,event_context,created_at\r\n"
+            '1,1000,login,"{""ip"": ""10.0.0.1""}",2024-01-01T00:00:00+00:00\r\n'
+            '2,1000,"multi\nline",,2024-01-02T00:00:00+00:00\r\n'
+        ),
+        content_type="text/csv",
+    )
+    responses.get(
+        url,
+        json=_envelope([{"id": "3", "created_at": "2024-01-03T00:00:00+00:00"}]),
+    )
+    responses.get(url, json=_envelope([]))
+
+    tap = _tap(audit_logs_bulk_export=True)
+    for stream in tap.streams.values():
+        stream.selected = stream.name == "audit_logs"
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+
+    assert [r["id"] for r in records] == ["1", "2", "3"]
+    assert records[0]["account_id"] == 1000  # noqa: PLR2004
+    assert records[0]["event_context"] == {"ip": "10.0.0.1"}
+    assert records[1]["event_type"] == "multi\nline"
+    assert "Authorization" not in export.calls[0].request.headers
+    # Paging resumes from the latest exported event
+    starts = [
+        call.request.params["logged_at_start"]
+        for call in responses.calls
+        if call.request.url.startswith(f"{url}?")
+    ]
+    assert min(starts) == "2024-01-02T00:00:00+00:00"
+
+
+@responses.activate
+def test_project_fan_out(capsys: pytest.CaptureFixture[str]):
+    """Projects are paged once, shared with project-scoped streams in any order."""
+    projects_url = f"{API_URL}/v2/accounts/1000/projects"
+    _add_pages(projects_url, [{"id": 1}, {"id": 2}], [{"id": 3}])
+    for project_id in (1, 2, 3):
+        _add_pages(
+            f"{API_URL}/v3/accounts/1000/projects/{project_id}/credentials/",
+            [{"id": project_id * 10, "project_id": project_id, "_password": "x"}],
+            [{"id": project_id * 10 + 1, "project_id": project_id}],
+        )
+
+    tap = _tap(page_size=2, max_concurrent_requests=2)
+    for stream in tap.streams.values():
+        stream.selected = stream.name in {"credentials", "projects"}
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m for m in messages if m["type"] == "RECORD"]
+
+    assert [r["record"]["id"] for r in records if r["stream"] == "credentials"] == [
+        10,
+        11,
+        20,
+        21,
+        30,
+        31,
+    ]
+    assert [r["record"]["id"] for r in records if r["stream"] == "projects"] == [
+        1,
+        2,
+        3,
+    ]
+    assert all("_password" not in r["record"] for r in records)
+    # Two pages of projects, then the empty page
+    assert responses.assert_call_count(f"{projects_url}?limit=2", 1)
+    assert responses.assert_call_count(f"{projects_url}?limit=2&offset=2", 1)
+    assert responses.assert_call_count(f"{projects_url}?limit=2&offset=4", 1)
+
+
+@responses.activate
+def test_project_index_without_projects_stream():
+    """Project-scoped streams fetch the projects themselves if needed."""
+    projects_url = f"{API_URL}/v2/accounts/1000/projects"
+    _add_pages(projects_url, [{"id": 1}])
+    _add_pages(f"{API_URL}/v3/accounts/1000/projects/1/credentials/", [{"id": 10}])
+
+    tap = _tap()
+    stream = tap.streams["credentials"]
+    context = {"account_id": "1000"}
+    assert [r["id"] for r in stream.get_records(context)] == [10]
+    assert tap.project_index.get_ids("1000") == [1]
+    assert [r["id"] for r in tap.streams["projects"].get_records(context)] == [1]
+    assert responses.assert_call_count(f"{projects_url}?limit=5000", 1)
+
+
+@responses.activate
+def test_environment_variables_matrix():
+    """Variable matrices are flattened into one record per variable and scope."""
+    _add_pages(f"{API_URL}/v2/accounts/1000/projects", [{"id": 1}])
+    url = f"{API_URL}/v3/accounts/1000/projects/1/environment-variables"
+    default = {"id": 1, "value": "analytics"}
+    responses.get(
+        f"{url}/environment/",
+        json={
+            "data": {
+                "DBT_SCHEMA": {
+                    "project": default,
+                    "Production": {"id": 2, "value": "p"},
+                },
+            },
+        },
+    )
+    responses.get(
+        f"{url}/job/",
+        json={"data": {"DBT_SCHEMA": {"project": default, "Nightly": {"id": 3}}}},
+    )
+    # Endpoints returning plain lists of variables are passed through
+    _add_pages(
+        f"{url}/user/",
+        [{"id": 4, "name": "DBT_SCHEMA", "type": "user", "user_id": 7}],
+    )
+
+    stream = _tap().streams["environment_variables"]
+    records = list(stream.get_records({"account_id": "1000"}))
+
+    assert [(r["id"], r["type"], r.get("scope")) for r in records] == [
+        (1, "project", "project"),
+        (2, "environment", "Production"),
+        (3, "job", "Nightly"),
+        (4, "user", None),
+    ]
+    assert records[0]["display_value"] == "analytics"
+    assert all(r["project_id"] == 1 and r["account_id"] == 1000 for r in records)  # noqa: PLR2004
+    # One request per scope, plus the empty page ending the list of user variables
+    assert sum(call.request.url.startswith(url) for call in responses.calls) == 4  # noqa: PLR2004
+
+
+@responses.activate
+def test_unselected_properties_pruned_before_post_process(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+):
+    """Records only keep selected and internally needed properties after parsing."""
+    catalog = _tap().catalog_dict
+    for stream in catalog["streams"]:
+        for entry in stream["metadata"]:
+            breadcrumb = entry["breadcrumb"]
+            if stream["tap_stream_id"] != "runs":
+                entry["metadata"]["selected"] = False
+            elif breadcrumb:
+                entry["metadata"]["selected"] = breadcrumb[-1] == "status"
+
+    run = {
+        "id": 1,
+        "status": 10,
+        "artifacts_saved": False,
+        "finished_at": "2024-01-01T00:00:00+00:00",
+        "job": {"id": 1, "execute_steps": ["dbt build"] * 100},
+        "trigger": {"cause": "Scheduled"},
+    }
+    _add_pages(f"{API_URL}/v2/accounts/1000/runs", [run])
+
+    rows: list[dict[str, Any]] = []
+    post_process = RunsStream.post_process
+
+    def spy(self: RunsStream, row: dict[str, Any], context: Any = None) -> Any:  # noqa: ANN401
+        rows.append(dict(row))
+        return post_process(self, row, context)
+
+    monkeypatch.setattr(RunsStream, "post_process", spy)
+    tap = TapDBT(config={"api_key": "abc123", "account_ids": ["1000"]}, catalog=catalog)
+    tap.sync_all()
+
+    assert rows[0] == {
+        "id": 1,
+        "status": 10,
+        "artifacts_saved": False,
+        "finished_at": "2024-01-01T00:00:00+00:00",
+    }
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    assert [set(record) for record in records] == [{"id", "status", "finished_at"}]
+
+
+@responses.activate
+def test_runs_partitioned_by_job(capsys: pytest.CaptureFixture[str]):
+    """Each job gets its own partition and bookmark, starting from the account's."""
+    _add_pages(f"{API_URL}/v2/accounts/1000/jobs", [{"id": 10}, {"id": 20}])
+    runs = {
+        "10": [
+            {"id": 1, "finished_at": "2024-01-02T00:00:00+00:00"},
+            {"id": 3, "finished_at": "2024-01-04T00:00:00+00:00"},
+            {"id": 5, "finished_at": "2024-01-06T00:00:00+00:00"},
+        ],
+        "20": [{"id": 2, "finished_at": "2024-01-03T00:00:00+00:00"}],
+    }
+    requested: list[dict[str, str]] = []
+
+    def runs_callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.url).query))
+        requested.append(params)
+        offset = int(params.get("offset", 0))
+        page = [
+            {
+                **run,
+                "job_definition_id": int(params["job_definition_id"]),
+                "artifacts_saved": False,
+            }
+            for run in runs[params["job_definition_id"]][offset : offset + 2]
+        ]
+        return 200, {}, json.dumps(_envelope(page))
+
+    responses.add_callback(
+        responses.GET,
+        f"{API_URL}/v2/accounts/1000/runs",
+        callback=runs_callback,
+    )
+
+    state = {
+        "bookmarks": {
+            "runs": {
+                "partitions": [
+                    {
+                        "context": {"account_id": "1000"},
+                        "replication_key": "finished_at",
+                        "replication_key_value": "2024-01-01T00:00:00+00:00",
+                    },
+                ],
+            },
+        },
+    }
+    tap = _tap(
+        state,
+        runs_partition_by_job=True,
+        page_size=2,
+        max_concurrent_requests=2,
+    )
+    for stream in tap.streams.values():
+        stream.selected = stream.name == "runs"
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    assert [(r["job_definition_id"], r["id"]) for r in records] == [
+        (10, 1),
+        (10, 3),
+        (10, 5),
+        (20, 2),
+    ]
+
+    # New job partitions start from the bookmark of their account
+    assert all(
+        json.loads(params["finished_at__range"])[0] == "2024-01-01T00:00:00"
+        for params in requested
+    )
+    partitions = messages[-1]["value"]["bookmarks"]["runs"]["partitions"]
+    assert {
+        partition["context"].get("job_definition_id"): partition[
+            "replication_key_value"
+        ]
+        for partition in partitions
+    } == {
+        None: "2024-01-01T00:00:00+00:00",
+        10: "2024-01-06T00:00:00+00:00",
+        20: "2024-01-03T00:00:00+00:00",
+    }
+
+
+@responses.activate
+def test_runs_status_filter_and_in_flight_runs(capsys: pytest.CaptureFixture[str]):
+    """Runs in progress at the last sync are fetched again by ID."""
+    url = f"{API_URL}/v2/accounts/1000/runs"
+    listed = [
+        {"id": 6, "status": 10, "finished_at": "2024-01-02T00:00:00+00:00"},
+        {"id": 4, "status": 20, "finished_at": "2024-01-03T00:00:00+00:00"},
+        {"id": 7, "status": 3, "finished_at": "2024-01-04T00:00:00+00:00"},
+    ]
+    _add_pages(url, [{**run, "artifacts_saved": False} for run in listed])
+    for run in (
+        # Finished before the bookmark, so it is no longer listed
+        {"id": 2, "status": 10, "finished_at": "2023-12-31T00:00:00+00:00"},
+        {"id": 3, "status": 3, "finished_at": None},
+        # Listed again, since it finished after the bookmark
+        {"id": 6, "status": 10, "finished_at": "2024-01-02T00:00:00+00:00"},
+    ):
+        responses.get(
+            f"{url}/{run['id']}/",
+            json={"data": {**run, "artifacts_saved": False}},
+        )
+    responses.get(f"{url}/5/", status=404)
+
+    state = {
+        "bookmarks": {
+            "runs": {
+                "partitions": [
+                    {
+                        "context": {"account_id": "1000"},
+                        "replication_key": "finished_at",
+                        "replication_key_value": "2024-01-01T00:00:00+00:00",
+                        "in_flight_run_ids": [2, 3, 5, 6],
+                    },
+                ],
+            },
+        },
+    }
+    tap = _tap(state, runs_status=[20, 10, 3])
+    for stream in tap.streams.values():
+        stream.selected = stream.name == "runs"
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [m["record"] for m in messages if m["type"] == "RECORD"]
+    assert [r["id"] for r in records] == [2, 6, 4, 7]
+
+    listing = next(
+        call for call in responses.calls if call.request.url.startswith(url + "?")
+    )
+    params = dict(
+        urllib.parse.parse_qsl(urllib.parse.urlsplit(listing.request.url).query)
+    )
+    assert json.loads(params["status__in"]) == [3, 10, 20]
+
+    (partition,) = messages[-1]["value"]["bookmarks"]["runs"]["partitions"]
+    assert partition["replication_key_value"] == "2024-01-04T00:00:00+00:00"
+    assert partition["in_flight_run_ids"] == [3, 7]
+
+
+@responses.activate
+def test_pipelined_pagination():
+    """The next page is requested while the records of a page are processed."""
+    url = f"{API_URL}/v2/accounts/1000/users"
+    requested: list[int] = []
+    second_page_requested = threading.Event()
+    total = 3
+
+    def callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.url).query))
+        offset = int(params.get("offset", 0))
+        requested.append(offset)
+        if offset == 2:  # noqa: PLR2004
+            second_page_requested.set()
+        ids = [
+            record_id
+            for record_id in range(1, total + 1)
+            if offset < record_id <= offset + 2
+        ]
+        return 200, {}, json.dumps(_envelope([{"id": record_id} for record_id in ids]))
+
+    responses.add_callback(responses.GET, url, callback=callback)
+    stream = _tap(page_size=2, pipelined_pagination=True).streams["users"]
+    context = {"account_id": "1000"}
+
+    records = iter(stream.get_records(context))
+    assert next(records)["id"] == 1
+    # Still processing the first page
+    assert second_page_requested.wait(timeout=5)
+    assert [record["id"] for record in records] == [2, 3]
+    assert requested == [0, 2, 4]
+
+    # Stopping early cancels the background requests, which stay a page ahead
+    requested.clear()
+    total = 20
+    records = iter(stream.get_records(context))
+    assert next(records)["id"] == 1
+    records.close()  # type: ignore[attr-defined]
+    assert len(requested) <= 3  # noqa: PLR2004
+
+
+def test_older_than():
+    """Timestamps are compared as strings when they share the layout of the bookmark."""
+    start = datetime.datetime(2024, 1, 2, 12, tzinfo=datetime.timezone.utc)
+    is_older = older_than(start)
+
+    assert is_older("2024-01-02T11:59:59+00:00")
+    assert not is_older("2024-01-02T12:00:00+00:00")
+    assert not is_older("2024-01-02T12:00:00.000001+00:00")
+    assert is_older("2024-01-02 11:00:00+00:00")
+    assert is_older("2024-01-02T13:00:00+02:00")
+    assert not is_older("2024-01-02T12:00:00Z")
+
+
+@responses.activate
+def test_incremental_pages_stop_at_bookmark(monkeypatch: pytest.MonkeyPatch):
+    """Benchmark a multi-page incremental sync, newest records first.
+
+    Whole pages newer than the bookmark pass without parsing any timestamp, and no
+    page after the one crossing the bookmark is requested.
+    """
+    url = f"{API_URL}/v2/accounts/1000/runs"
+    page_size = 100
+    newest = datetime.datetime(2024, 6, 1, tzinfo=datetime.timezone.utc)
+    runs = [
+        {
+            "id": run_id,
+            "finished_at": (newest - datetime.timedelta(minutes=run_id)).isoformat(),
+            "artifacts_saved": False,
+        }
+        for run_id in range(page_size * 20)
+    ]
+    requested: list[int] = []
+
+    def callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+        params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(request.url).query))
+        offset = int(params.get("offset", 0))
+        requested.append(offset)
+        return 200, {}, json.dumps(_envelope(runs[offset : offset + page_size]))
+
+    responses.add_callback(responses.GET, url, callback=callback)
+
+    parsed: list[str] = []
+
+    class _Datetime(datetime.datetime):
+        @classmethod
+        def fromisoformat(cls, date_string: str) -> datetime.datetime:
+            parsed.append(date_string)
+            return datetime.datetime.fromisoformat(date_string)
+
+    monkeypatch.setattr(
+        "tap_dbt.streams.datetime",
+        types.SimpleNamespace(**{**vars(datetime), "datetime": _Datetime}),
+    )
+
+    # The bookmark falls in the middle of the sixth page
+    bookmark = runs[page_size * 5 + page_size // 2]["finished_at"]
+    state = {
+        "bookmarks": {
+            "runs": {
+                "partitions": [
+                    {
+                        "context": {"account_id": "1000"},
+                        "replication_key": "finished_at",
+                        "replication_key_value": bookmark,
+                    },
+                ],
+            },
+        },
+    }
+    stream = _tap(state, page_size=page_size).streams["runs"]
+    context = {"account_id": "1000"}
+    stream._write_starting_replication_value(context)  # noqa: SLF001
+
+    started = time.perf_counter()
+    records = list(stream.get_records(context))
+    elapsed = time.perf_counter() - started
+
+    assert [record["id"] for record in records] == list(range(page_size * 5 + 51))
+    assert requested == [page_size * page for page in range(6)]
+    assert parsed == []
+    stream.logger.info("Synced %d records in %.3f seconds", len(records), elapsed)
@@ -0,0 +1,95 @@
+"""Tests for the buffered Singer message writer."""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import responses
+from singer_sdk.io_base import SingerWriter
+from singer_sdk.singerlib import RecordMessage, SchemaMessage, StateMessage
+
+from tap_dbt.tap import TapDBT
+from tap_dbt.writer import BufferedSingerWriter
+
+if TYPE_CHECKING:
+    from singer_sdk.singerlib.encoding.simple import Message
+
+EXTRACTED = datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        RecordMessage(stream="runs", record={"id": 1, "status": 10, "tags": []}),
+        RecordMessage(
+            stream='odd "stream" ü',
+            record={"name": "nightly ü \u2028 \x00", "nested": {"a": [1, None, True]}},
+            version=1700000000000,
+            time_extracted=EXTRACTED,
+        ),
+        RecordMessage(
+            stream="run_results",
+            record={
+                "execution_time": decimal.Decimal("1.2500"),
+                "ratio": 0.1,
+                "nan": float("nan"),
+                "at": EXTRACTED,
+            },
+            time_extracted=EXTRACTED,
+        ),
+        SchemaMessage(stream="runs", schema={"type": "object"}, key_properties=["id"]),
+        StateMessage(value={"bookmarks": {"runs": {"replication_key_value": "x"}}}),
+    ],
+)
+def test_same_output_as_sdk_writer(message: Message):
+    """Messages are serialized byte for byte like the SDK writer does."""
+    assert BufferedSingerWriter().format_message(message) == (
+        SingerWriter().format_message(message)
+    )
+
+
+def test_buffered_until_state(capsys: pytest.CaptureFixture[str]):
+    """Messages are only written once the buffer is full or with a STATE message."""
+    writer = BufferedSingerWriter(buffer_size=100)
+
+    writer.write_message(RecordMessage(stream="runs", record={"id": 1}))
+    assert capsys.readouterr().out == ""
+
+    writer.write_message(StateMessage(value={"bookmarks": {}}))
+    assert capsys.readouterr().out.splitlines() == [
+        '{"type":"RECORD","stream":"runs","record":{"id":1}}',
+        '{"type":"STATE","value":{"bookmarks":{}}}',
+    ]
+
+    writer.write_message(RecordMessage(stream="runs", record={"id": "x" * 100}))
+    assert len(capsys.readouterr().out.splitlines()) == 1
+
+
+def _sync(capsys: pytest.CaptureFixture[str], **config: Any) -> list[dict[str, Any]]:  # noqa: ANN401
+    tap = TapDBT(config={"api_key": "abc123", "account_ids": ["1000"], **config})
+    for stream in tap.streams.values():
+        stream.selected = stream.name == "repositories"
+    tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    for message in messages:
+        message.pop("time_extracted", None)
+    return messages
+
+
+@responses.activate
+def test_buffered_sync(capsys: pytest.CaptureFixture[str]):
+    """A sync writes the same messages with and without buffering."""
+    url = "https://cloud.getdbt.com/api/v2/accounts/1000/repositories"
+    responses.get(url, json={"data": [{"id": 1, "name": "a"}, {"id": 2}]})
+    responses.get(url, json={"data": []})
+    responses.get(url, json={"data": [{"id": 1, "name": "a"}, {"id": 2}]})
+    responses.get(url, json={"data": []})
+
+    messages = _sync(capsys)
+    assert [m["record"]["id"] for m in messages if m["type"] == "RECORD"] == [1, 2]
+    assert _sync(capsys, buffered_output=True) == messages